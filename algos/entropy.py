@@ -0,0 +1,122 @@
+import time
+
+import numpy as np
+
+import algos.vectorized as vec
+
+"""
+Entropy sources for the hybrid generators.
+
+The hybrids take their starting x, and every reseed, from an entropy source
+instead of calling time.time_ns() directly:
+
+    Clock()        the live clock (the original behaviour)
+    Fixed(seed)    always seed, so every reseed restarts from the same x
+    Counter(seed)  read i is SplitMix64 output i of seed: deterministic,
+                   well mixed and without a syscall in the hot loop
+
+With Fixed or Counter a generator's output is byte-identical between runs.
+read_lanes(k) serves k lanes at once; element j equals what lane(j).read()
+would return, so lane j of a lane-parallel generator matches the scalar
+generator built with lane(j). Lane j reads derive(value, j) rather than
+value + j: lanes started from consecutive values would step in near lockstep.
+"""
+
+
+def _splitmix64(z: int) -> int:
+    z = ((z ^ (z >> 30)) * 0xBF58476D1CE4E5B9) & vec.MASK64
+    z = ((z ^ (z >> 27)) * 0x94D049BB133111EB) & vec.MASK64
+    return z ^ (z >> 31)
+
+
+# Key j of a seed, mixed so that neighbouring seeds and indices give
+# unrelated keys
+def derive(seed: int, j: int) -> int:
+    return _splitmix64(_splitmix64(seed & vec.MASK64) ^ j)
+
+
+# derive(seed, j) for j in range(k)
+def derive_lanes(seed: int, k: int) -> np.ndarray:
+    z = np.arange(k, dtype=np.uint64)
+    z ^= np.uint64(_splitmix64(seed & vec.MASK64))
+    return vec.splitmix64_mix(z)
+
+
+class Clock:
+    # The clock plus offset; a lane reads derive(clock + offset, lane)
+    __slots__ = ("offset", "index")
+
+    def __init__(self, offset: int = 0, index: int = None):
+        self.offset, self.index = offset, index
+
+    def read(self) -> int:
+        t = time.time_ns() + self.offset
+        return t if self.index is None else derive(t, self.index)
+
+    def read_lanes(self, k: int) -> np.ndarray:
+        return derive_lanes(time.time_ns() + self.offset, k)
+
+    def lane(self, j: int) -> "Clock":
+        return Clock(self.offset, j)
+
+    def getstate(self):
+        return None
+
+    def setstate(self, state) -> None:
+        pass
+
+
+class Fixed:
+    __slots__ = ("seed",)
+
+    def __init__(self, seed: int):
+        self.seed = seed & vec.MASK64
+
+    def read(self) -> int:
+        return self.seed
+
+    def read_lanes(self, k: int) -> np.ndarray:
+        return derive_lanes(self.seed, k)
+
+    def lane(self, j: int) -> "Fixed":
+        return Fixed(derive(self.seed, j))
+
+    def getstate(self):
+        return None
+
+    def setstate(self, state) -> None:
+        pass
+
+
+class Counter:
+    __slots__ = ("seed", "count")
+
+    def __init__(self, seed: int):
+        self.seed = seed & vec.MASK64
+        self.count = 0
+
+    def read(self) -> int:
+        self.count += 1
+        return _splitmix64((self.seed + self.count * vec.SPLITMIX_GAMMA) & vec.MASK64)
+
+    def read_lanes(self, k: int) -> np.ndarray:
+        self.count += 1
+        z = derive_lanes(self.seed, k)
+        z += np.uint64((self.count * vec.SPLITMIX_GAMMA) & vec.MASK64)
+        return vec.splitmix64_mix(z)
+
+    def lane(self, j: int) -> "Counter":
+        lane = Counter(derive(self.seed, j))
+        lane.count = self.count
+        return lane
+
+    def getstate(self):
+        return self.count
+
+    def setstate(self, state) -> None:
+        self.count = state
+
+
+# Entropy source for an optional seed: the clock when None, else a Counter
+def source(seed: int = None):
+    return Clock() if seed is None else Counter(seed)
@@ -4,6 +4,8 @@ from pathlib import Path
 
 import numpy as np
 
+import binaryGen as gen
+
 Path("./results").mkdir(parents=True, exist_ok=True)
 
 
@@ -61,18 +63,14 @@ def convert_to_bits(sequence):
     Convert a sequence of numbers in [0, 1] to binary bits (0 or 1).
 
     :param sequence: List of floating-point numbers.
-    :return: List of binary bits.
+    :return: Array of binary bits.
     """
-    return [1 if num > 0.5 else 0 for num in sequence]
+    return gen.threshold_bits(sequence)
 
 
 def save_to_binary_file(sequence, filename="./results/prng_output.bin"):
-    with open(filename, "wb") as f:
-        byte_arr = bytearray()
-        for i in range(0, len(sequence), 8):
-            byte = sum([bit << (7 - j) for j, bit in enumerate(sequence[i : i + 8])])
-            byte_arr.append(byte)
-        f.write(byte_arr)
+    # Bits packed MSB first, the last byte padded with zeros
+    gen.write_bits(filename, [sequence])
 
 
 # Example Usage
@@ -0,0 +1,675 @@
+import copy
+import math
+from functools import lru_cache
+
+import numpy as np
+
+import algos.entropy as ent
+import algos.jump as jmp
+import algos.maps as mp
+import algos.vectorized as vec
+
+"""
+Stateful generator objects.
+
+A Generator keeps its state between calls, so a stream can be continued,
+saved with getstate() and restored with setstate() instead of being reseeded
+for every block. Output goes either to a new array (next_block) or straight
+into a caller-owned buffer (fill).
+
+Generators that support jump(k) can also be split with spawn(k) into
+substreams jump_size outputs apart, so parallel workers never overlap as
+long as each draws fewer than jump_size values.
+
+The reference generators produce raw 32/64-bit words; reduce them with
+vec.reduce(words, m). The hybrid generators take m and a at construction and
+produce values already reduced modulo m + 1; they draw their seed and
+reseeds from an entropy source (algos/entropy.py, the clock by default).
+"""
+
+
+def rotl(x: int, k: int, bits: int = 64) -> int:
+    mask = (1 << bits) - 1
+    return ((x << k) & mask) | (x >> (bits - k))
+
+
+class Generator:
+    __slots__ = ()
+    dtype = np.uint64
+    jump_size = 0  # Substream length used by spawn(); 0 if jumps are unsupported
+
+    def next_block(self, k: int) -> np.ndarray:
+        out = np.empty(k, dtype=self.dtype)
+        self._fill(out)
+        return out
+
+    def fill(self, out: np.ndarray) -> np.ndarray:
+        # Fill a caller-owned 1-D buffer, converting if its dtype differs.
+        if out.dtype == self.dtype:
+            self._fill(out)
+        else:
+            out[:] = self.next_block(len(out))
+        return out
+
+    def _fill(self, out: np.ndarray) -> None:
+        raise NotImplementedError
+
+    def getstate(self) -> tuple:
+        raise NotImplementedError
+
+    def setstate(self, state: tuple) -> None:
+        raise NotImplementedError
+
+    def jump(self, k: int) -> None:
+        # Advance the state by k outputs without generating them.
+        raise NotImplementedError(f"{type(self).__name__} does not support jumps")
+
+    def spawn(self, k: int) -> list["Generator"]:
+        # Split off k substreams, each jump_size outputs after the previous
+        # one, and move this generator past all of them.
+        children = []
+        for _ in range(k):
+            children.append(copy.deepcopy(self))
+            self.jump(self.jump_size)
+        return children
+
+    def substream(self, i: int) -> "Generator":
+        # Move to the start of the i-th substream that spawn() would hand out.
+        if i:
+            self.jump(i * self.jump_size)
+        return self
+
+
+# ---------------------------------------------------------------------------
+# Reference generators (NumPy block kernels from algos/vectorized.py)
+# ---------------------------------------------------------------------------
+
+
+class MT19937(Generator):
+    __slots__ = ("state", "index")
+    dtype = np.uint32
+    jump_size = 1 << 128
+
+    def __init__(self, seed: int = 5489):
+        self.state = vec.mt_seed(seed)
+        self.index = vec.MT_N  # Force twist on first extraction
+
+    def _fill(self, out):
+        self.index = vec.mt_fill(out, self.state, self.index)
+
+    def getstate(self):
+        return tuple(self.state.tolist()), self.index
+
+    def setstate(self, state):
+        words, self.index = state
+        self.state = np.array(words, dtype=np.uint32)
+
+    def jump(self, k):
+        self.state, self.index = jmp.mt_jump(self.state, self.index, k)
+
+
+class PCG(Generator):
+    __slots__ = ("state", "inc")
+    dtype = np.uint32
+    jump_size = 1 << 48
+
+    def __init__(self, seed: int = 42, inc: int = vec.PCG_INC):
+        self.state = seed & vec.MASK64
+        self.inc = inc
+
+    def _fill(self, out):
+        self.state = vec.pcg_fill(out, self.state, self.inc)
+
+    def getstate(self):
+        return self.state, self.inc
+
+    def setstate(self, state):
+        self.state, self.inc = state
+
+    def jump(self, k):
+        self.state = jmp.pcg_jump(self.state, k, self.inc)
+
+
+class XorShift128Plus(Generator):
+    __slots__ = ("s0", "s1")
+    dtype = np.uint64
+    jump_size = 1 << 64
+
+    def __init__(self, seed1: int = 123456789, seed2: int = 362436069):
+        self.s0 = seed1 & vec.MASK64
+        self.s1 = seed2 & vec.MASK64
+
+    def _fill(self, out):
+        self.s0, self.s1 = vec.xorshift128plus_fill(out, self.s0, self.s1)
+
+    def getstate(self):
+        return self.s0, self.s1
+
+    def setstate(self, state):
+        self.s0, self.s1 = state
+
+    def jump(self, k):
+        self.s0, self.s1 = jmp.xorshift128plus_jump(self.s0, self.s1, k)
+
+
+class WELL512a(Generator):
+    __slots__ = ("state", "index")
+    dtype = np.uint32
+    jump_size = 1 << 256
+
+    def __init__(self, seed: int = 123456789):
+        self.state = vec.well512a_seed(seed)
+        self.index = 0
+
+    def _fill(self, out):
+        self.index = vec.well512a_fill(out, self.state, self.index)
+
+    def getstate(self):
+        return tuple(self.state.tolist()), self.index
+
+    def setstate(self, state):
+        words, self.index = state
+        self.state = np.array(words, dtype=np.uint32)
+
+    def jump(self, k):
+        self.state, self.index = jmp.well512a_jump(self.state, self.index, k)
+
+
+class SplitMix64(Generator):
+    __slots__ = ("state",)
+    dtype = np.uint64
+    jump_size = 1 << 48
+
+    def __init__(self, seed: int = 42):
+        self.state = seed & vec.MASK64
+
+    def _fill(self, out):
+        self.state = vec.splitmix64_fill(out, self.state)
+
+    def getstate(self):
+        return (self.state,)
+
+    def setstate(self, state):
+        (self.state,) = state
+
+    def jump(self, k):
+        self.state = jmp.splitmix64_jump(self.state, k)
+
+
+# ---------------------------------------------------------------------------
+# (m, n, a) block wrappers, returning np.ndarray instead of list. `stream`
+# selects a non-overlapping substream, e.g. one per worker.
+# ---------------------------------------------------------------------------
+
+
+@lru_cache(maxsize=64)
+def _start_state(cls: type, args: tuple, stream: int) -> tuple:
+    return cls(*args).substream(stream).getstate()
+
+
+def seeded(cls: type, *args, stream: int = 0) -> Generator:
+    # A generator at the start of a substream. The seeded and jumped state
+    # is cached, so repeated calls skip the seeding loop and the jump.
+    g = cls(*args)
+    g.setstate(_start_state(cls, args, stream))
+    return g
+
+
+def mt19937(m: int, n: int, _: int, seed: int = 5489, stream: int = 0) -> np.ndarray:
+    return vec.reduce(seeded(MT19937, seed, stream=stream).next_block(n), m)
+
+
+def pcg(
+    m: int, n: int, _: int, seed: int = 42, inc=vec.PCG_INC, stream: int = 0
+) -> np.ndarray:
+    return vec.reduce(seeded(PCG, seed, inc, stream=stream).next_block(n), m)
+
+
+def xorshift128plus(
+    m: int, n: int, _: int, seed1: int = 123456789, seed2=362436069, stream: int = 0
+) -> np.ndarray:
+    g = seeded(XorShift128Plus, seed1, seed2, stream=stream)
+    return vec.reduce(g.next_block(n), m)
+
+
+def well512a(m: int, n: int, _: int, seed: int = 123456789, stream: int = 0) -> np.ndarray:
+    return vec.reduce(seeded(WELL512a, seed, stream=stream).next_block(n), m)
+
+
+def splitmix64(m: int, n: int, _: int, seed: int = 42, stream: int = 0) -> np.ndarray:
+    return vec.reduce(seeded(SplitMix64, seed, stream=stream).next_block(n), m)
+
+
+# Algorithms with a block backend, selectable by name (see VECTORIZE in env.config)
+BACKENDS = {
+    "mt19937": mt19937,
+    "pcg": pcg,
+    "xorshift128plus": xorshift128plus,
+    "well512a": well512a,
+    "splitmix64": splitmix64,
+}
+
+
+# ---------------------------------------------------------------------------
+# Hybrid generators (values modulo m + 1, reseeded from an entropy source)
+# ---------------------------------------------------------------------------
+
+
+def reseed_period(w: float, m: int) -> int:
+    """
+    Samples between two reseeds of a switching hybrid: w * m, rounded.
+
+    A period that rounds to 0 (w * m < 0.5, e.g. m = 10 and w = 0.01) used to
+    divide by zero; it now reseeds before every sample instead.
+    """
+    if not 0 < w < math.inf:
+        raise ValueError(f"w must be a positive fraction of m, got {w}")
+    return max(round(w * m), 1)
+
+
+class Hybrid(Generator):
+    """
+    Engine of the hybrid generators: x steps modulo m + 1 and is reseeded
+    from the entropy source every worst_case_period samples (never when w
+    is None).
+
+    A variant is a configuration of constants(), the step's arguments,
+    computed once per generator, and _segment(), a tight loop over the
+    samples between two reseeds. _fill() splits each block at the reseed
+    points, so no step tests the counter.
+    """
+
+    __slots__ = ("m", "a", "c", "worst_case_period", "consts", "x", "i", "entropy")
+
+    def __init__(self, m: int, a: int, c: int = 0, w: float = None, entropy=None):
+        self.m, self.a, self.c = m, a, c
+        self.worst_case_period = 0 if w is None else reseed_period(w, m)
+        self.consts = self.constants()
+        self.entropy = entropy or ent.Clock()
+        self.x = self.entropy.read()
+        self.i = 0
+
+    def constants(self) -> tuple:
+        # Only c + a * x modulo m + 1 matters, so a and c are reduced once and
+        # the products stay below (m + 1)^2 instead of growing with a and n**2
+        mod = self.m + 1
+        return self.a % mod, self.c % mod, mod
+
+    def _segment(self, values: list, x: int, k: int) -> int:
+        # Append k steps of x = (c + a * x) % (m + 1) to values; returns x
+        a, c, mod = self.consts
+        for _ in range(k):
+            x = (c + a * x) % mod
+            values.append(x)
+        return x
+
+    def _fill(self, out):
+        x, i, period, read = self.x, self.i, self.worst_case_period, self.entropy.read
+        values = []
+        rest = len(out)
+        while rest:
+            k = rest
+            if period:
+                if i % period == 0:
+                    x = read()
+                k = min(rest, period - i % period)
+            x = self._segment(values, x, k)
+            i += k
+            rest -= k
+        out[:] = values
+        self.x, self.i = x, i
+
+    def getstate(self):
+        return self.x, self.i, self.entropy.getstate()
+
+    def setstate(self, state):
+        self.x, self.i, entropy = state
+        self.entropy.setstate(entropy)
+
+
+class HybridPRNG(Hybrid):
+    # x = (c + a * x) % (m + 1), never reseeded; hprng.hybrid_prng uses c = n**2
+    __slots__ = ()
+
+    def __init__(self, m: int, a: int, c: int = 0, entropy=None):
+        super().__init__(m, a, c, None, entropy)
+
+
+class SwitchPRNG(Hybrid):
+    # HybridPRNG reseeded every round(w * m) samples.
+    __slots__ = ()
+
+    def __init__(self, m: int, a: int, c: int = 0, w: float = 0.01, entropy=None):
+        super().__init__(m, a, c, w, entropy)
+
+
+class SwitchShiftPRNG(SwitchPRNG):
+    # x = ((c + a * x) << 5) % (m + 1); the shift folds into a and c.
+    __slots__ = ()
+
+    def constants(self):
+        mod = self.m + 1
+        return (self.a << 5) % mod, (self.c << 5) % mod, mod
+
+
+class SwitchMaskShiftPRNG(SwitchPRNG):
+    # x = ((c + (x ^ a)) << 5) % (m + 1)
+    __slots__ = ()
+
+    def constants(self):
+        return self.a, self.c % (self.m + 1), self.m + 1  # x ^ a needs all of a
+
+    def _segment(self, values, x, k):
+        a, c, mod = self.consts
+        for _ in range(k):
+            x = (c + (x ^ a) << 5) % mod
+            values.append(x)
+        return x
+
+
+class ChaosHPRNG(Hybrid):
+    # Mixes a tent map and a logistic map orbit into the switch recurrence.
+    __slots__ = ("t", "l")
+
+    def __init__(self, m: int, a: int, w: float = 0.01, entropy=None):
+        super().__init__(m, a, 0, w, entropy)
+        self.t = (self.x % 1_000_000) / 1_000_000
+        self.l = self.t
+
+    def constants(self):
+        return self.a, self.m + 1  # The XOR with the mix needs all of x * a
+
+    def mix(self, x: int, t: float, l: float) -> int:
+        return int(t * 1_000_000) ^ int(l * 1_000_000)
+
+    def _segment(self, values, x, k):
+        a, mod = self.consts
+        t, l, mix, tent, logistic = self.t, self.l, self.mix, mp.tent, mp.logistic
+        for _ in range(k):
+            t = tent(t, 2)
+            l = logistic(l, r=3.99)
+            x = (mix(x, t, l) ^ (x * a)) % mod
+            values.append(x)
+        self.t, self.l = t, l
+        return x
+
+    def getstate(self):
+        return self.x, self.t, self.l, self.i, self.entropy.getstate()
+
+    def setstate(self, state):
+        self.x, self.t, self.l, self.i, entropy = state
+        self.entropy.setstate(entropy)
+
+
+class TentHybrid3(ChaosHPRNG):
+    # ChaosHPRNG with an extra rotation of the mix by both orbits.
+    __slots__ = ()
+
+    def mix(self, x, t, l):
+        mix = int(t * 1_000_000) ^ int(l * 1_000_000)
+        return rotl(mix, int(t * 64)) ^ rotl(x, int(l * 64))
+
+
+# Default number of lanes of the lane-parallel hybrids
+LANES = 4096
+
+
+class Lanes(Generator):
+    # Independent instances advanced in lockstep, one per element of x,
+    # their outputs interleaved: output s * lanes + j is step s of lane j.
+    # Subclasses fill whole rows of steps in _rows.
+    __slots__ = ()
+
+    def _rows(self, buf: np.ndarray) -> None:
+        raise NotImplementedError
+
+    def _fill(self, out):
+        done = min(len(self.pending), len(out))
+        out[:done], self.pending = self.pending[:done], self.pending[done:]
+        rest = len(out) - done
+        if rest:
+            buf = np.empty((-(-rest // len(self.x)), len(self.x)), dtype=np.uint64)
+            self._rows(buf)
+            flat = buf.reshape(-1)
+            out[done:], self.pending = flat[:rest], flat[rest:].copy()
+
+
+class ChaosLanes(Lanes):
+    """
+    `lanes` independent ChaosHPRNG instances advanced in lockstep with 64-bit
+    NumPy arithmetic, their outputs interleaved: output s * lanes + j is
+    step s of lane j.
+
+    Lane j is exactly ChaosHPRNG(m, a, w, entropy.lane(j)): each read of
+    the entropy source serves all lanes at once (entropy.read_lanes). See
+    vec.chaos_fill for the step. Requires m + 1 <= 2^40 and a < 2^64.
+    """
+
+    __slots__ = ("m", "a", "worst_case_period", "x", "t", "l", "i", "pending", "entropy")
+    mix = staticmethod(vec.chaos_mix)
+
+    def __init__(
+        self, m: int, a: int, w: float = 0.01, lanes: int = LANES, entropy=None
+    ):
+        if m + 1 > vec.MAX_LANE_MOD:
+            raise ValueError(f"m = {m} is too large for lanes (m + 1 <= 2^40)")
+        if not 0 <= a < 1 << 64:
+            raise ValueError(f"a = {a} does not fit in 64 bits")
+        self.m, self.a = m, a
+        self.worst_case_period = reseed_period(w, m)
+        self.entropy = entropy or ent.Clock()
+        self.x = self.entropy.read_lanes(lanes)
+        self.t = (self.x % np.uint64(1_000_000)) / 1_000_000
+        self.l = self.t.copy()
+        self.i = 0
+        self.pending = np.empty(0, dtype=np.uint64)  # Rest of the last row
+
+    def _rows(self, buf):
+        self.i = vec.chaos_fill(
+            buf, self.x, self.t, self.l, self.i,
+            self.a, self.m, self.worst_case_period, self.mix,
+            lambda: self.entropy.read_lanes(len(self.x)),
+        )
+
+    def getstate(self):
+        return (
+            self.x.copy(), self.t.copy(), self.l.copy(), self.i,
+            self.pending.copy(), self.entropy.getstate(),
+        )
+
+    def setstate(self, state):
+        x, t, l, self.i, pending, entropy = state
+        self.x, self.t, self.l = x.copy(), t.copy(), l.copy()
+        self.pending = pending.copy()
+        self.entropy.setstate(entropy)
+
+
+class TentHybrid3Lanes(ChaosLanes):
+    # TentHybrid3 in lanes.
+    __slots__ = ()
+    mix = staticmethod(vec.tent_hybrid_3_mix)
+
+
+class SwitchLanes(Lanes):
+    """
+    `lanes` independent SwitchPRNG instances in 64-bit NumPy arithmetic,
+    interleaved like ChaosLanes.
+
+    Lane j is exactly SwitchPRNG(m, a, c, w, entropy.lane(j)); a and c are
+    reduced once and every product modulo m + 1 (vec.affine_step), so no
+    operand grows with a or n**2 and the steps allocate nothing. See
+    vec.switch_fill. Requires m + 1 < 2^50.
+    """
+
+    __slots__ = ("m", "a", "c", "worst_case_period", "consts", "x", "i", "pending", "entropy")
+    step = staticmethod(vec.affine_step)
+
+    def __init__(
+        self, m: int, a: int, c: int = 0, w: float = 0.01, lanes: int = LANES, entropy=None
+    ):
+        if m + 1 >= vec.MAX_FIXED_MOD:
+            raise ValueError(f"m = {m} is too large for lanes (m + 1 < 2^50)")
+        self.m, self.a, self.c = m, a, c
+        self.worst_case_period = 0 if w is None else reseed_period(w, m)
+        self.consts = self.constants(a, c, m + 1)
+        self.entropy = entropy or ent.Clock()
+        self.x = self.load(self.entropy.read_lanes(lanes))
+        self.i = 0
+        self.pending = np.empty(0, dtype=np.uint64)
+
+    def constants(self, a: int, c: int, mod: int) -> tuple:
+        return vec.affine_constants(a, c, mod)
+
+    def load(self, seeds: np.ndarray) -> np.ndarray:
+        # x as affine_step takes it; x % (m + 1) gives the same steps
+        return seeds % np.uint64(self.m + 1)
+
+    def _rows(self, buf):
+        self.i = vec.switch_fill(
+            buf, self.x, self.i, self.m + 1, self.worst_case_period, self.step, self.consts,
+            lambda: self.load(self.entropy.read_lanes(len(self.x))),
+        )
+
+    def getstate(self):
+        return self.x.copy(), self.i, self.pending.copy(), self.entropy.getstate()
+
+    def setstate(self, state):
+        x, self.i, pending, entropy = state
+        self.x, self.pending = x.copy(), pending.copy()
+        self.entropy.setstate(entropy)
+
+
+class HybridLanes(SwitchLanes):
+    # HybridPRNG in lanes, never reseeded.
+    __slots__ = ()
+
+    def __init__(self, m: int, a: int, c: int = 0, lanes: int = LANES, entropy=None):
+        super().__init__(m, a, c, None, lanes, entropy)
+
+
+class SwitchShiftLanes(SwitchLanes):
+    # SwitchShiftPRNG in lanes; the shift folds into the constants.
+    __slots__ = ()
+
+    def constants(self, a, c, mod):
+        return vec.affine_constants(a, c, mod, 5)
+
+
+class SwitchMaskShiftLanes(SwitchLanes):
+    # SwitchMaskShiftPRNG in lanes; x ^ a needs the whole seed. Requires a < 2^64.
+    __slots__ = ()
+    step = staticmethod(vec.mask_shift_step)
+
+    def constants(self, a, c, mod):
+        return vec.mask_shift_constants(a, c, mod)
+
+    def load(self, seeds):
+        return seeds
+
+
+# Lane generators, or the scalar generator where m or a is too large for lanes
+def chaos_lanes(m: int, a: int, w: float, lanes: int, entropy, tent: bool = False) -> Generator:
+    if m + 1 > vec.MAX_LANE_MOD or not 0 <= a < 1 << 64:
+        return (TentHybrid3 if tent else ChaosHPRNG)(m, a, w, entropy)
+    return (TentHybrid3Lanes if tent else ChaosLanes)(m, a, w, lanes, entropy)
+
+
+def switch_lanes(m: int, a: int, c: int, w: float, lanes: int, entropy) -> Generator:
+    # w = None: HybridPRNG, never reseeded
+    if m + 1 >= vec.MAX_FIXED_MOD:
+        return HybridPRNG(m, a, c, entropy) if w is None else SwitchPRNG(m, a, c, w, entropy)
+    if w is None:
+        return HybridLanes(m, a, c, lanes, entropy)
+    return SwitchLanes(m, a, c, w, lanes, entropy)
+
+
+# (m, n, a) wrappers in the style of BACKENDS
+def chaos_hprng_lanes(
+    m: int, n: int, a: int, w: float = 0.01, lanes: int = LANES, seed: int = None
+) -> np.ndarray:
+    return chaos_lanes(m, a, w, min(lanes, n), ent.source(seed)).next_block(n)
+
+
+def tent_hybrid_3_lanes(
+    m: int, n: int, a: int, w: float = 0.01, lanes: int = LANES, seed: int = None
+) -> np.ndarray:
+    return chaos_lanes(m, a, w, min(lanes, n), ent.source(seed), tent=True).next_block(n)
+
+
+def hybrid_prng_lanes(m: int, n: int, a: int, lanes: int = LANES, seed: int = None) -> np.ndarray:
+    return switch_lanes(m, a, n**2, None, min(lanes, n), ent.source(seed)).next_block(n)
+
+
+def switch_prng_lanes(
+    m: int, n: int, a: int, w: float = 0.01, lanes: int = LANES, seed: int = None
+) -> np.ndarray:
+    return switch_lanes(m, a, n**2, w, min(lanes, n), ent.source(seed)).next_block(n)
+
+
+# The lane-parallel hybrids, selectable like BACKENDS (see VECTORIZE in env.config)
+BACKENDS["chprng"] = tent_hybrid_3_lanes
+BACKENDS["hybrid"] = hybrid_prng_lanes
+BACKENDS["switch"] = switch_prng_lanes
+
+
+# ---------------------------------------------------------------------------
+# Chunked streams equivalent to the (m, n, a) functions of algos/hprng.py
+# ---------------------------------------------------------------------------
+
+
+class Reduced(Generator):
+    # Raw words of another generator, reduced modulo m + 1.
+    __slots__ = ("inner", "m")
+
+    def __init__(self, inner: Generator, m: int):
+        self.inner, self.m = inner, m
+
+    def _fill(self, out):
+        out[:] = vec.reduce(self.inner.next_block(len(out)), self.m)
+
+    def getstate(self):
+        return self.inner.getstate()
+
+    def setstate(self, state):
+        self.inner.setstate(state)
+
+
+REFERENCE = {
+    "mt19937": MT19937,
+    "pcg": PCG,
+    "xorshift128plus": XorShift128Plus,
+    "well512a": WELL512a,
+    "splitmix64": SplitMix64,
+}
+
+HYBRID = {
+    "hybrid_prng": lambda m, n, a, w, e: HybridPRNG(m, a, n**2, e),
+    "switch_prng": lambda m, n, a, w, e: SwitchPRNG(m, a, n**2, w, e),
+    "switch_shift_prng": lambda m, n, a, w, e: SwitchShiftPRNG(m, a, n**2, w, e),
+    "switch_mask_shift_prng": lambda m, n, a, w, e: SwitchMaskShiftPRNG(m, a, n**2, w, e),
+    "chaos_hprng": lambda m, n, a, w, e: ChaosHPRNG(m, a, w, e),
+    "tent_hybrid_3": lambda m, n, a, w, e: TentHybrid3(m, a, w, e),
+    "chaos_hprng_lanes": lambda m, n, a, w, e: chaos_lanes(m, a, w, min(LANES, n), e),
+    "tent_hybrid_3_lanes": lambda m, n, a, w, e: chaos_lanes(
+        m, a, w, min(LANES, n), e, tent=True
+    ),
+    "hybrid_prng_lanes": lambda m, n, a, w, e: switch_lanes(m, a, n**2, None, min(LANES, n), e),
+    "switch_prng_lanes": lambda m, n, a, w, e: switch_lanes(m, a, n**2, w, min(LANES, n), e),
+}
+
+
+# Whether open_stream can stand in for func, an hprng function or a backend
+def has_stream(func) -> bool:
+    name = func.__name__
+    return func.__module__ in ("algos.hprng", __name__) and (name in REFERENCE or name in HYBRID)
+
+
+def open_stream(
+    name: str, m: int, n: int, a: int, stream: int = 0, seed: int = None, w: float = 0.01
+) -> Generator:
+    # A generator yielding the same n values as the hprng function `name`
+    # called with (m, n, a) (and seed and w, for the hybrids), to be consumed
+    # in chunks.
+    if name in REFERENCE:
+        return Reduced(seeded(REFERENCE[name], stream=stream), m)
+    return HYBRID[name](m, n, a, w, ent.source(seed))
@@ -0,0 +1,156 @@
+from functools import lru_cache
+
+import numpy as np
+
+"""
+Linear algebra over GF(2) for generators whose state transition is linear
+(xorshift128+, WELL512a, MT19937). A state is packed into a single Python int
+and a matrix is stored as a tuple of its columns, so that M @ v is the XOR of
+the columns selected by the set bits of v. Polynomials are Python ints too,
+bit i holding the coefficient of x^i.
+"""
+
+
+def linear_matrix(step, bits: int) -> tuple:
+    # Column j is the image of the j-th unit vector under one step.
+    return tuple(step(1 << j) for j in range(bits))
+
+
+def mat_tables(cols: tuple) -> list[list[int]]:
+    # Precompute XOR combinations of each group of 8 columns so that a
+    # matrix-vector product costs one lookup per byte of the state.
+    tables = []
+    for base in range(0, len(cols), 8):
+        group = cols[base : base + 8]
+        table = [0] * 256
+        for byte in range(1, 256):
+            low = byte & -byte
+            table[byte] = table[byte ^ low] ^ group[low.bit_length() - 1]
+        tables.append(table)
+    return tables
+
+
+def mat_vec(tables: list[list[int]], v: int) -> int:
+    result = 0
+    for table in tables:
+        result ^= table[v & 0xFF]
+        v >>= 8
+    return result
+
+
+def mat_mul(a: tuple, b: tuple) -> tuple:
+    # (A @ B) e_j = A (B e_j)
+    tables = mat_tables(a)
+    return tuple(mat_vec(tables, col) for col in b)
+
+
+def mat_pow(cols: tuple, k: int) -> tuple:
+    result = tuple(1 << j for j in range(len(cols)))
+    base = cols
+    while k:
+        if k & 1:
+            result = mat_mul(base, result)
+        k >>= 1
+        if k:
+            base = mat_mul(base, base)
+    return result
+
+
+@lru_cache(maxsize=32)
+def jump_tables(step, bits: int, k: int) -> list[list[int]]:
+    # Lookup tables for the k-step transition matrix of a linear generator.
+    return mat_tables(mat_pow(linear_matrix(step, bits), k))
+
+
+# Spread the 8 bits of a byte into the even bits of a 16-bit word
+SPREAD = np.array(
+    [sum(((b >> i) & 1) << (2 * i) for i in range(8)) for b in range(256)],
+    dtype="<u2",
+)
+
+
+def berlekamp_massey(bits: np.ndarray) -> int:
+    # Minimal polynomial of a binary sequence, returned in characteristic
+    # form: sum p_i * s[t + i] = 0 for every t.
+    n = len(bits)
+    pad = -n % 8
+    # Bit (n - 1 - j) of rev is s[j], so rev >> (n - 1 - k) has s[k - i] at bit i.
+    rev = int.from_bytes(np.packbits(bits).tobytes(), "big") >> pad
+    c, b = 1, 1
+    length, shift = 0, 1
+    for k in range(n):
+        if (c & (rev >> (n - 1 - k))).bit_count() & 1 == 0:
+            shift += 1
+        elif 2 * length <= k:
+            c, b = c ^ (b << shift), c
+            length = k + 1 - length
+            shift = 1
+        else:
+            c ^= b << shift
+            shift += 1
+    return int(format(c, f"0{length + 1}b")[::-1], 2)
+
+
+def charpoly(step, bits: int, start: int = 1) -> int:
+    # Characteristic polynomial of a linear step function, recovered from
+    # the lowest state bit. Valid for generators whose polynomial is
+    # irreducible, which holds for every full-period linear generator here.
+    seq = np.empty(2 * bits, dtype=np.uint8)
+    v = start
+    for k in range(2 * bits):
+        seq[k] = v & 1
+        v = step(v)
+    return berlekamp_massey(seq)
+
+
+def poly_square(a: int) -> int:
+    # Squaring over GF(2) just interleaves zeros between the coefficients.
+    raw = np.frombuffer(a.to_bytes((a.bit_length() + 7) // 8, "little"), np.uint8)
+    return int.from_bytes(SPREAD[raw].tobytes(), "little")
+
+
+@lru_cache(maxsize=8)
+def mod_table(p: int) -> list[int]:
+    # Multiples of p indexed by their top byte, to clear 8 bits per step.
+    deg = p.bit_length() - 1
+    table = [0] * 256
+    for u in range(256):
+        v = 0
+        for i in range(8):
+            if (u >> i) & 1:
+                v ^= p << i
+        table[v >> deg] = v
+    return table
+
+
+def poly_mod(r: int, p: int) -> int:
+    deg = p.bit_length() - 1
+    table = mod_table(p)
+    while r.bit_length() > deg + 8:
+        shift = r.bit_length() - 8 - deg
+        r ^= table[r >> (shift + deg)] << shift
+    while r.bit_length() > deg:
+        r ^= p << (r.bit_length() - 1 - deg)
+    return r
+
+
+@lru_cache(maxsize=32)
+def poly_powx(k: int, p: int) -> int:
+    # x^k mod p by left-to-right square-and-multiply.
+    result = 1
+    for bit in bin(k)[2:]:
+        result = poly_mod(poly_square(result), p)
+        if bit == "1":
+            result = poly_mod(result << 1, p)
+    return result
+
+
+def poly_apply(step, poly: int, v: int) -> int:
+    # poly(T) v for the linear map T given by step.
+    acc = 0
+    while poly:
+        if poly & 1:
+            acc ^= v
+        v = step(v)
+        poly >>= 1
+    return acc
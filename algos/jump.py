@@ -0,0 +1,89 @@
+from functools import lru_cache
+
+import numpy as np
+
+import algos.gf2 as gf2
+import algos.vectorized as vec
+
+"""
+Jump-ahead for the reference generators.
+
+Each *_jump function returns the state reached after k outputs without
+producing them. PCG and SplitMix64 jump in closed form; the GF(2)-linear
+generators (xorshift128+, WELL512a, MT19937) evaluate x^k modulo their
+characteristic polynomial and apply it to the state, all in O(log k)
+polynomial operations.
+"""
+
+
+def pcg_jump(state: int, k: int, inc: int = vec.PCG_INC) -> int:
+    mult, plus = vec.lcg_coefficients(k, vec.PCG_MULT, inc)
+    return (mult * state + plus) & vec.MASK64
+
+
+def splitmix64_jump(state: int, k: int) -> int:
+    return (state + vec.SPLITMIX_GAMMA * k) & vec.MASK64
+
+
+@lru_cache(maxsize=None)
+def xorshift128plus_poly() -> int:
+    return gf2.charpoly(vec.xorshift128plus_step, 128)
+
+
+def xorshift128plus_jump(s0: int, s1: int, k: int) -> tuple[int, int]:
+    poly = gf2.poly_powx(k, xorshift128plus_poly())
+    v = gf2.poly_apply(vec.xorshift128plus_step, poly, s0 | (s1 << 64))
+    return v & vec.MASK64, v >> 64
+
+
+@lru_cache(maxsize=None)
+def well512a_poly() -> int:
+    return gf2.charpoly(vec.well512a_step, 512)
+
+
+def well512a_jump(state: np.ndarray, index: int, k: int) -> tuple[np.ndarray, int]:
+    poly = gf2.poly_powx(k, well512a_poly())
+    v = gf2.poly_apply(vec.well512a_step, poly, vec.well512a_pack(state, index))
+    return np.array(vec.well512a_unpack(v), dtype=np.uint32), 0
+
+
+def mt_words(state: np.ndarray, count: int) -> np.ndarray:
+    # The word sequence w_B, w_B+1, ... starting with the current array.
+    blocks = [state.copy()]
+    s = state.copy()
+    while len(blocks) * vec.MT_N < count:
+        vec.mt_twist(s)
+        blocks.append(s.copy())
+    return np.concatenate(blocks)
+
+
+@lru_cache(maxsize=None)
+def mt_poly() -> int:
+    # Degree 19937; recovered from the top bit of 2 * 19937 twisted words.
+    words = mt_words(vec.mt_seed(5489), 2 * 19937 + vec.MT_N)[vec.MT_N :]
+    return gf2.berlekamp_massey((words[: 2 * 19937] >> 31).astype(np.uint8))
+
+
+def mt_jump(state: np.ndarray, index: int, k: int) -> tuple[np.ndarray, int]:
+    # The array is a window of 624 consecutive words of the recurrence
+    # w[t + 624] = w[t + 397] ^ f(w[t], w[t + 1]); only whole windows are
+    # jumped, the remainder goes into the index.
+    q, index = divmod(index + k, vec.MT_N)
+    if q == 0:
+        return state.copy(), index
+    # The low 31 bits of the first word never feed the recurrence, so
+    # x^(624q) mod P can be wrong there. Jumping one step short and then
+    # once more with the extra factor x shifts that word out.
+    poly = gf2.poly_powx(vec.MT_N * q - 1, mt_poly()) << 1
+    words = mt_words(state, poly.bit_length() + vec.MT_N)
+    bits = np.unpackbits(
+        np.frombuffer(poly.to_bytes((poly.bit_length() + 7) // 8, "little"), np.uint8),
+        bitorder="little",
+    )
+    coeffs = np.flatnonzero(bits)
+    window = np.arange(vec.MT_N)
+    result = np.zeros(vec.MT_N, dtype=np.uint32)
+    for start in range(0, len(coeffs), 1024):
+        chunk = coeffs[start : start + 1024]
+        result ^= np.bitwise_xor.reduce(words[chunk[:, None] + window], axis=0)
+    return result, index
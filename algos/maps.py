@@ -1,10 +1,27 @@
-import numpy as np
 import math
 
+import numpy as np
+
+"""
+Chaotic maps.
+
+The scalar maps advance one orbit by one step on Python floats. The *_array
+maps advance a population of independent orbits in lockstep: x is an array
+of states and every element takes one step, elementwise equal to the scalar
+map (gauss and chebyshev may differ in the last bit, as NumPy and math have
+separate exp/cos implementations). orbits() iterates a population for many
+steps.
+
+Floating-point tent(x, 2) doubles away one mantissa bit per step and hits 0
+after about 53 steps. tent_int is an integer tent map that does not: it
+permutes {1, ..., m}.
+"""
+
+
 def gauss(
     x: float, alpha: float = 0.3, beta: float = -0.7
 ) -> float:  # a > 0 ; -1 < b < 1
-    return np.exp(-alpha * x**2) + beta
+    return math.exp(-alpha * x**2) + beta
 
 
 def tent(x: float, mu: float = 1.7) -> float:  # 0 < x < 1 ; 1 < mu < 2
@@ -14,6 +31,65 @@ def tent(x: float, mu: float = 1.7) -> float:  # 0 < x < 1 ; 1 < mu < 2
 def logistic(x: float, r: float = 3.99) -> float:
     return r * x * (1 - x)
 
+
 def chebyshev(x, n):
     # Ensure x is in the valid range [-1, 1] for arccos.
-    return 0.99 * math.cos(n * math.acos(x))
\ No newline at end of file
+    return 0.99 * math.cos(n * math.acos(x))
+
+
+def gauss_array(
+    x: np.ndarray, alpha: float = 0.3, beta: float = -0.7
+) -> np.ndarray:
+    return np.exp(-alpha * x**2) + beta
+
+
+def tent_array(x: np.ndarray, mu: float = 1.7) -> np.ndarray:
+    return np.where(x < 0.5, mu * x, mu * (1 - x))
+
+
+def logistic_array(x: np.ndarray, r: float = 3.99) -> np.ndarray:
+    return r * x * (1 - x)
+
+
+def chebyshev_array(x: np.ndarray, n) -> np.ndarray:
+    return 0.99 * np.cos(n * np.arccos(x))
+
+
+# Integer tent map of Masuda and Aihara on {1, ..., m} with the peak at a:
+#   x <= a:  ceil(m * x / a)
+#   x >  a:  floor(m * (m - x) / (m - a)) + 1
+# It is a bijection, so no orbit collapses; x / m approximates the real tent
+# map with mu = m / a. a = m / 2 exactly gives short, regular cycles, hence
+# the default a = m // 2 + 1. m < 2^32 keeps m * x within uint64.
+TENT_M = 2**32 - 5
+TENT_A = TENT_M // 2 + 1
+
+
+def tent_int(x: int, m: int = TENT_M, a: int = TENT_A) -> int:
+    return -(-m * x // a) if x <= a else m * (m - x) // (m - a) + 1
+
+
+def tent_int_array(x: np.ndarray, m: int = TENT_M, a: int = TENT_A) -> np.ndarray:
+    x = np.asarray(x, dtype=np.uint64)
+    m, a = np.uint64(m), np.uint64(a)
+    low = (m * x + a - np.uint64(1)) // a
+    high = m * np.where(x > a, m - x, 0) // (m - a) + np.uint64(1)
+    return np.where(x <= a, low, high)
+
+
+def orbits(step, x0, n: int, *args) -> np.ndarray:
+    """
+    Iterate a population of orbits in lockstep.
+
+    :param step: An *_array map (or tent_int_array).
+    :param x0: Starting state of every orbit.
+    :param n: Number of steps.
+    :param args: Extra parameters of the map, e.g. mu for tent_array.
+    :return: Array of shape (n, len(x0)); row i holds the states after
+        i + 1 steps.
+    """
+    x = np.asarray(x0)
+    out = np.empty((n, len(x)), dtype=x.dtype)
+    for i in range(n):
+        x = out[i] = step(x, *args)
+    return out
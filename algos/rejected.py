@@ -1,5 +1,6 @@
 import time
-import maps as mp
+import numpy as np
+import algos.maps as mp
 
 INT_BITS = 64
 
@@ -0,0 +1,466 @@
+from math import isqrt
+
+import numpy as np
+
+import algos.gf2 as gf2
+import algos.maps as mp
+
+"""
+NumPy block backends for the generators in algos/hprng.py.
+
+Each *_fill kernel writes raw generator output into a caller-owned array and
+returns the advanced state, producing exactly the same stream as the scalar
+implementation. The generator objects in algos/generators.py are built on
+these kernels. The chaos hybrids run many independent instances as lanes
+instead, each lane matching one scalar instance.
+"""
+
+MASK32 = 0xFFFFFFFF
+MASK64 = (1 << 64) - 1
+
+# Generators with less output than this are not worth splitting into lanes.
+MIN_LANE_BLOCK = 256
+
+
+def reduce(raw: np.ndarray, m: int) -> np.ndarray:
+    # Reduce raw output modulo m + 1, widening so that m may exceed 32 bits.
+    return raw.astype(np.uint64, copy=False) % np.uint64(m + 1)
+
+
+def lane_shape(n: int) -> tuple[int, int]:
+    # Split n outputs into (lanes, block) with lanes * block >= n.
+    block = max(isqrt(n), 1)
+    return -(-n // block), block
+
+
+# ---------------------------------------------------------------------------
+# MT19937
+# ---------------------------------------------------------------------------
+
+MT_N = 624
+MT_M = 397
+MT_MATRIX_A = 0x9908B0DF
+
+
+def mt_seed(seed: int) -> np.ndarray:
+    state = [0] * MT_N
+    state[0] = seed & MASK32
+    for i in range(1, MT_N):
+        state[i] = (1812433253 * (state[i - 1] ^ (state[i - 1] >> 30)) + i) & MASK32
+    return np.array(state, dtype=np.uint32)
+
+
+def _mt_mix(cur: np.ndarray, nxt: np.ndarray, far: np.ndarray) -> np.ndarray:
+    y = (cur & 0x80000000) | (nxt & 0x7FFFFFFF)
+    return far ^ (y >> 1) ^ ((y & 1) * np.uint32(MT_MATRIX_A))
+
+
+def mt_twist(state: np.ndarray) -> None:
+    # The sequential twist reads state[i + 397], which is already rewritten
+    # for i >= 227. Splitting at 227 and 454 makes every slice depend only
+    # on values that are final by the time it is computed.
+    split = MT_N - MT_M
+    state[:split] = _mt_mix(state[:split], state[1 : split + 1], state[MT_M:])
+    state[split : 2 * split] = _mt_mix(
+        state[split : 2 * split], state[split + 1 : 2 * split + 1], state[:split]
+    )
+    state[2 * split : MT_N - 1] = _mt_mix(
+        state[2 * split : MT_N - 1], state[2 * split + 1 :], state[split : MT_M - 1]
+    )
+    state[MT_N - 1 :] = _mt_mix(state[MT_N - 1 :], state[:1], state[MT_M - 1 : MT_M])
+
+
+def mt_temper(y: np.ndarray) -> None:
+    y ^= y >> 11
+    y ^= (y << 7) & 0x9D2C5680
+    y ^= (y << 15) & 0xEFC60000
+    y ^= y >> 18
+
+
+def mt_fill(out: np.ndarray, state: np.ndarray, index: int) -> int:
+    # Fill out with tempered words, twisting state in place. Returns the new
+    # index; an index of 624 means the next extraction twists first.
+    n = len(out)
+    pos = 0
+    while pos < n:
+        if index >= MT_N:
+            mt_twist(state)
+            index = 0
+        k = min(MT_N - index, n - pos)
+        out[pos : pos + k] = state[index : index + k]
+        pos += k
+        index += k
+    mt_temper(out)
+    return index
+
+
+# ---------------------------------------------------------------------------
+# PCG (XSH-RR 64/32)
+# ---------------------------------------------------------------------------
+
+PCG_MULT = 6364136223846793005
+PCG_INC = 1442695040888963407
+
+
+def lcg_coefficients(delta: int, mult: int, inc: int) -> tuple[int, int]:
+    # (A, C) such that delta LCG steps equal x -> A * x + C (mod 2^64),
+    # computed in O(log delta) (Brown, "Random number generation with
+    # arbitrary strides").
+    acc_mult, acc_plus = 1, 0
+    cur_mult, cur_plus = mult, inc
+    while delta > 0:
+        if delta & 1:
+            acc_mult = (acc_mult * cur_mult) & MASK64
+            acc_plus = (acc_plus * cur_mult + cur_plus) & MASK64
+        cur_plus = ((cur_mult + 1) * cur_plus) & MASK64
+        cur_mult = (cur_mult * cur_mult) & MASK64
+        delta >>= 1
+    return acc_mult, acc_plus
+
+
+def pcg_states(state: int, n: int, inc: int = PCG_INC) -> np.ndarray:
+    # The n states following `state`, built by doubling: once the first k
+    # states are known, the next k are the same lanes jumped k steps ahead.
+    states = np.empty(n, dtype=np.uint64)
+    if n == 0:
+        return states
+    states[0] = (state * PCG_MULT + inc) & MASK64
+    k = 1
+    stride_mult, stride_plus = PCG_MULT, inc
+    while k < n:
+        width = min(k, n - k)
+        states[k : k + width] = states[:width] * np.uint64(stride_mult) + np.uint64(
+            stride_plus
+        )
+        stride_plus = ((stride_mult + 1) * stride_plus) & MASK64
+        stride_mult = (stride_mult * stride_mult) & MASK64
+        k += width
+    return states
+
+
+def pcg_output(states: np.ndarray, out: np.ndarray) -> None:
+    xorshifted = (((states >> 18) ^ states) >> 27).astype(np.uint32)
+    rot = (states >> 59).astype(np.uint32)
+    out[:] = (xorshifted >> rot) | (xorshifted << ((-rot) & 31))
+
+
+def pcg_fill(out: np.ndarray, state: int, inc: int = PCG_INC) -> int:
+    if len(out) == 0:
+        return state
+    states = pcg_states(state, len(out), inc)
+    pcg_output(states, out)
+    return int(states[-1])
+
+
+# ---------------------------------------------------------------------------
+# SplitMix64
+# ---------------------------------------------------------------------------
+
+SPLITMIX_GAMMA = 0x9E3779B97F4A7C15
+
+
+def splitmix64_mix(z: np.ndarray) -> np.ndarray:
+    # SplitMix64 output function of states z, modifying z in place.
+    z ^= z >> 30
+    z *= np.uint64(0xBF58476D1CE4E5B9)
+    z ^= z >> 27
+    z *= np.uint64(0x94D049BB133111EB)
+    z ^= z >> 31
+    return z
+
+
+def splitmix64_fill(out: np.ndarray, state: int) -> int:
+    # The i-th state is seed + (i + 1) * gamma, so the whole block is a
+    # closed-form function of the index range.
+    n = len(out)
+    z = np.arange(1, n + 1, dtype=np.uint64) * np.uint64(SPLITMIX_GAMMA)
+    z += np.uint64(state)
+    out[:] = splitmix64_mix(z)
+    return (state + SPLITMIX_GAMMA * n) & MASK64
+
+
+# ---------------------------------------------------------------------------
+# xorshift128+
+# ---------------------------------------------------------------------------
+
+
+def xorshift128plus_step(v: int) -> int:
+    # One transition on the packed state s0 | s1 << 64.
+    s0, s1 = v & MASK64, v >> 64
+    s1 ^= (s1 << 23) & MASK64
+    return (s0 ^ s1 ^ (s1 >> 17) ^ (s0 >> 26)) | (s0 << 64)
+
+
+def xorshift128plus_fill(out: np.ndarray, s0: int, s1: int) -> tuple[int, int]:
+    # Lanes start `block` steps apart (via the GF(2) jump matrix) and are
+    # advanced in lockstep; their concatenation is the sequential stream.
+    n = len(out)
+    if n == 0:
+        return s0, s1
+    lanes, block = lane_shape(n) if n >= MIN_LANE_BLOCK else (1, n)
+    tables = gf2.jump_tables(xorshift128plus_step, 128, block) if lanes > 1 else None
+    starts = [s0 | (s1 << 64)]
+    for _ in range(lanes - 1):
+        starts.append(gf2.mat_vec(tables, starts[-1]))
+
+    a = np.array([v & MASK64 for v in starts], dtype=np.uint64)
+    b = np.array([v >> 64 for v in starts], dtype=np.uint64)
+    buf = np.empty((block, lanes), dtype=np.uint64)
+    lane, offset = divmod(n, block)
+    final = None
+    for step in range(block):
+        if step == offset and lane < lanes:
+            final = int(a[lane]), int(b[lane])
+        buf[step] = a + b
+        t = b ^ (b << 23)
+        a, b = a ^ t ^ (t >> 17) ^ (a >> 26), a
+    if final is None:
+        final = int(a[-1]), int(b[-1])
+    out[:] = buf.T.reshape(-1)[:n]
+    return final
+
+
+# ---------------------------------------------------------------------------
+# WELL512a
+# ---------------------------------------------------------------------------
+
+
+def well512a_seed(seed: int) -> np.ndarray:
+    state = [0] * 16
+    state[0] = seed & MASK32
+    for i in range(1, 16):
+        state[i] = (1812433253 * (state[i - 1] ^ (state[i - 1] >> 30)) + i) & MASK32
+    return np.array(state, dtype=np.uint32)
+
+
+def well512a_pack(state: np.ndarray, index: int) -> int:
+    # Pack the ring buffer in canonical order, starting at `index`.
+    v = 0
+    for k in range(16):
+        v |= int(state[(index + k) & 15]) << (32 * k)
+    return v
+
+
+def well512a_unpack(v: int) -> list[int]:
+    return [(v >> (32 * k)) & MASK32 for k in range(16)]
+
+
+def well512a_step(v: int) -> int:
+    s = well512a_unpack(v)
+    a, c = s[0], s[13]
+    b = a ^ c ^ ((a << 16) & MASK32) ^ ((c << 15) & MASK32)
+    c = s[9]
+    c ^= c >> 11
+    a = s[0] = (b ^ c) & MASK32
+    d = a ^ ((a << 5) & 0xDA442D24)
+    a = s[15]
+    s[15] = (
+        a ^ b ^ d ^ ((a << 2) & MASK32) ^ ((b << 18) & MASK32) ^ ((c << 28) & MASK32)
+    )
+    # The index moves to 15, which becomes the first canonical word.
+    return well512a_pack(s, 15)
+
+
+def well512a_fill(out: np.ndarray, state: np.ndarray, index: int) -> int:
+    # Same lane scheme as xorshift128+, with all lanes sharing one ring index.
+    # Writes the advanced ring back into `state` and returns the new index.
+    n = len(out)
+    if n == 0:
+        return index
+    lanes, block = lane_shape(n) if n >= MIN_LANE_BLOCK else (1, n)
+    tables = gf2.jump_tables(well512a_step, 512, block) if lanes > 1 else None
+    starts = [well512a_pack(state, index)]
+    for _ in range(lanes - 1):
+        starts.append(gf2.mat_vec(tables, starts[-1]))
+
+    ring = np.array([well512a_unpack(v) for v in starts], dtype=np.uint32).T.copy()
+    buf = np.empty((block, lanes), dtype=np.uint32)
+    lane, offset = divmod(n, block)
+    final = None
+    i = 0
+    for step in range(block):
+        if step == offset and lane < lanes:
+            final = ring[:, lane].copy(), i
+        a = ring[i]
+        c = ring[(i + 13) & 15]
+        b = a ^ c ^ (a << 16) ^ (c << 15)
+        c = ring[(i + 9) & 15]
+        c = c ^ (c >> 11)
+        a = ring[i] = b ^ c
+        d = a ^ ((a << 5) & 0xDA442D24)
+        i = (i + 15) & 15
+        a = ring[i]
+        ring[i] = a ^ b ^ d ^ (a << 2) ^ (b << 18) ^ (c << 28)
+        buf[step] = ring[i]
+    if final is None:
+        final = ring[:, -1].copy(), i
+    out[:] = buf.T.reshape(-1)[:n]
+
+    # A lane column and the shared index form a valid (state, index) pair.
+    state[:], index = final
+    return index
+
+
+
+# ---------------------------------------------------------------------------
+# Chaos hybrids (chaos_hprng, tent_hybrid_3) in lanes
+# ---------------------------------------------------------------------------
+
+# Lanes support moduli up to 2^40, so mulmod products stay below 2^64.
+MAX_LANE_MOD = 1 << 40
+
+
+def rotl64(x: np.ndarray, k: np.ndarray) -> np.ndarray:
+    # Rotate 64-bit words left; k = 0 and k = 64 both leave x unchanged,
+    # as rotl(x, k) does for x < 2^64.
+    k = k & np.uint64(63)
+    return (x << k) | (x >> ((np.uint64(64) - k) & np.uint64(63)))
+
+
+def mul128(x: np.ndarray, a: int) -> tuple[np.ndarray, np.ndarray]:
+    # Full 128-bit product of uint64 words and a < 2^64, as (high, low)
+    x_lo, x_hi = x & np.uint64(MASK32), x >> np.uint64(32)
+    a_lo, a_hi = np.uint64(a & MASK32), np.uint64(a >> 32)
+    ll, lh, hl, hh = x_lo * a_lo, x_lo * a_hi, x_hi * a_lo, x_hi * a_hi
+    mid = (ll >> np.uint64(32)) + (lh & np.uint64(MASK32)) + (hl & np.uint64(MASK32))
+    low = (ll & np.uint64(MASK32)) | (mid << np.uint64(32))
+    high = hh + (lh >> np.uint64(32)) + (hl >> np.uint64(32)) + (mid >> np.uint64(32))
+    return high, low
+
+
+def mulmod(u: np.ndarray, v: int, mod: int) -> np.ndarray:
+    # u * v % mod for u, v < mod <= 2^40, in two 20-bit halves of v
+    v_hi, v_lo = np.uint64(v >> 20), np.uint64(v & 0xFFFFF)
+    mod = np.uint64(mod)
+    r = u * v_hi % mod
+    return ((r << np.uint64(20)) + u * v_lo) % mod
+
+
+def chaos_mix(x: np.ndarray, t: np.ndarray, l: np.ndarray) -> np.ndarray:
+    # ChaosHPRNG.mix
+    return (t * 1_000_000).astype(np.uint64) ^ (l * 1_000_000).astype(np.uint64)
+
+
+def tent_hybrid_3_mix(x: np.ndarray, t: np.ndarray, l: np.ndarray) -> np.ndarray:
+    # TentHybrid3.mix
+    mix = chaos_mix(x, t, l)
+    return rotl64(mix, (t * 64).astype(np.uint64)) ^ rotl64(x, (l * 64).astype(np.uint64))
+
+
+def chaos_fill(out, x, t, l, i, a, m, period, mix, reseed) -> int:
+    """
+    Advance every lane by len(out) steps, writing step s of lane j to
+    out[s, j]. x, t and l are per-lane states, updated in place; i is the
+    step counter shared by all lanes and reseed() returns new x values for
+    all lanes. Per lane this is exactly the scalar step
+
+        if i % period == 0: x = <clock>
+        t = tent(t, 2); l = logistic(l, 3.99)
+        x = (mix(x, t, l) ^ (x * a)) % (m + 1)
+
+    Since mix < 2^64, the XOR only touches the low word of the 128-bit
+    product x * a, and the high word is folded back as high * 2^64 mod m + 1.
+
+    :return: The advanced step counter.
+    """
+    mod = m + 1
+    wrap = (1 << 64) % mod
+    modulus = np.uint64(mod)
+    for row in out:
+        if i % period == 0:
+            x[:] = reseed()
+        t[:] = mp.tent_array(t, 2)
+        l[:] = mp.logistic_array(l, r=3.99)
+        high, low = mul128(x, a)
+        x[:] = (mulmod(high % modulus, wrap, mod) + (mix(x, t, l) ^ low) % modulus) % modulus
+        row[:] = x
+        i += 1
+    return i
+
+
+# ---------------------------------------------------------------------------
+# Switch hybrids (hybrid_prng, switch_*) in lanes
+# ---------------------------------------------------------------------------
+
+# Fixed-width lanes support moduli below 2^50, so quotients fit a double.
+MAX_FIXED_MOD = 1 << 50
+
+
+def affine_constants(a: int, c: int, mod: int, shift: int = 0) -> tuple[int, int, float]:
+    # Constants of affine_step for x = (c + a * x) << shift mod `mod`. Only
+    # c + a * x modulo mod matters, and so only a and c modulo mod.
+    a, c = (a << shift) % mod, (c << shift) % mod
+    return a, c, a / mod
+
+
+def affine_step(x: np.ndarray, consts: tuple, mod: int, scratch: tuple) -> None:
+    """
+    x = (c + a * x) % mod in place, for uint64 lanes x < mod < 2^50, without
+    a 128-bit product or a division (Barrett reduction with a floating-point
+    reciprocal).
+
+    The quotient x * a / mod is estimated as x * (a / mod) in float64. Both
+    roundings are relative errors of 2^-53 on a quotient below 2^50, so the
+    estimate is off by less than one and x * a - q * mod, computed in
+    wrapping 64-bit arithmetic, lies in [-mod, 2 * mod). One correction
+    each way makes it exact. All temporaries live in `scratch`.
+    """
+    a, c, ratio = consts
+    q, f, flag = scratch
+    np.multiply(x, ratio, out=f)
+    np.copyto(q, f, casting="unsafe")  # Truncates; the estimate is >= 0
+    q *= np.uint64(mod)
+    x *= np.uint64(a)
+    x -= q
+    r = x.view(np.int64)
+    np.less(r, 0, out=flag)
+    np.add(r, mod, out=r, where=flag)  # Now in [0, 2 * mod)
+    np.greater_equal(r, mod, out=flag)
+    np.subtract(r, mod, out=r, where=flag)  # a * x % mod
+    r += c - mod  # In [-mod, mod)
+    np.less(r, 0, out=flag)
+    np.add(r, mod, out=r, where=flag)
+
+
+def mask_shift_constants(a: int, c: int, mod: int) -> tuple[int, int]:
+    # Constants of mask_shift_step; x ^ a needs all of a, in 64 bits
+    if not 0 <= a < 1 << 64:
+        raise ValueError(f"a = {a} does not fit in 64 bits")
+    return a, c % mod
+
+
+def mask_shift_step(x: np.ndarray, consts: tuple, mod: int, scratch: tuple) -> None:
+    # x = (c + (x ^ a) << 5) % mod in place, for uint64 lanes x and
+    # mod < 2^50, so (c + (x ^ a) % mod) << 5 stays below 2^56
+    a, c = consts
+    modulus = np.uint64(mod)
+    x ^= np.uint64(a)
+    x %= modulus
+    x += np.uint64(c)
+    x <<= np.uint64(5)
+    x %= modulus
+
+
+def switch_fill(out, x, i, mod, period, step, consts, reseed) -> int:
+    """
+    Advance every lane by len(out) steps, writing step s of lane j to
+    out[s, j]. x is the per-lane state, updated in place; i is the step
+    counter shared by all lanes and reseed() returns new x values for all
+    lanes. Per lane this is exactly the scalar step
+
+        if period and i % period == 0: x = <clock>
+        x = step(x)
+
+    with period 0 for the hybrid, which never reseeds. Scratch buffers are
+    allocated once per call, so the steps themselves allocate nothing.
+
+    :return: The advanced step counter.
+    """
+    scratch = (np.empty_like(x), np.empty(x.shape), np.empty(x.shape, dtype=bool))
+    for row in out:
+        if period and i % period == 0:
+            x[:] = reseed()
+        step(x, consts, mod, scratch)
+        row[:] = x
+        i += 1
+    return i
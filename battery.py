@@ -0,0 +1,216 @@
+# Extended randomness test battery on NumPy arrays
+# Bit stream or normalized [0, 1) array -> (statistic, p-value) per test
+#
+# Bit tests follow NIST SP 800-22 and take a uint8 array of 0/1 values; the
+# gap test takes normalized numbers and m, birthday spacings uint numbers in
+# [0, m]. Every test runs in O(n) or O(n log n). Register new tests with
+# @registry.plugin("test", input=...) and their input kind.
+
+import math
+
+import numpy as np
+from scipy.special import erfc, gammaincc
+from scipy.stats import chisquare, norm, poisson
+
+import registry
+
+
+# Convert normalized numbers from [0, m] into a bit stream. Numbers below
+# the largest power of two 2^w <= m + 1 (w at most 32) are kept and give
+# w unbiased bits each, MSB first; the others are dropped.
+def to_bits(x: np.ndarray, m: int) -> np.ndarray:
+    width = min(max(int(math.log2(m + 1)), 1), 32)
+    values = (np.asarray(x) * (m + 1)).round()
+    words = values[values < 2**width].astype(">u4")
+    bits = np.unpackbits(words.view(np.uint8)).reshape(len(words), 32)
+    return bits[:, 32 - width :].ravel()
+
+
+# Bit stream of a binary file, e.g. one written by binaryGen
+def load_bits(path: str) -> np.ndarray:
+    return np.unpackbits(np.fromfile(path, dtype=np.uint8))
+
+
+@registry.plugin("test", input="bits")
+def monobit(bits: np.ndarray) -> tuple:
+    n = len(bits)
+    s_obs = abs(2 * int(bits.sum()) - n) / math.sqrt(n)
+    return s_obs, erfc(s_obs / math.sqrt(2))
+
+
+@registry.plugin("test", input="bits")
+def block_frequency(bits: np.ndarray, block: int = 128) -> tuple:
+    blocks = len(bits) // block
+    pi = bits[: blocks * block].reshape(blocks, block).mean(axis=1)
+    chi2 = 4 * block * ((pi - 0.5) ** 2).sum()
+    return chi2, gammaincc(blocks / 2, chi2 / 2)
+
+
+@registry.plugin("test", input="bits")
+def runs(bits: np.ndarray) -> tuple:
+    n = len(bits)
+    pi = bits.mean()
+    if abs(pi - 0.5) >= 2 / math.sqrt(n):
+        return np.nan, 0.0  # Fails the frequency prerequisite
+    v_obs = 1 + int(np.count_nonzero(bits[1:] != bits[:-1]))
+    stat = abs(v_obs - 2 * n * pi * (1 - pi)) / (2 * math.sqrt(2 * n) * pi * (1 - pi))
+    return v_obs, erfc(stat)
+
+
+# Block size, category bounds and category probabilities by sequence length
+LONGEST_RUN = [
+    (750_000, 10_000, 10, 16, [0.0882, 0.2092, 0.2483, 0.1933, 0.1208, 0.0675, 0.0727]),
+    (6272, 128, 4, 9, [0.1174, 0.2430, 0.2493, 0.1752, 0.1027, 0.1124]),
+    (128, 8, 1, 4, [0.2148, 0.3672, 0.2305, 0.1875]),
+]
+
+
+@registry.plugin("test", input="bits")
+def longest_run(bits: np.ndarray) -> tuple:
+    n = len(bits)
+    for min_n, block, low, high, probs in LONGEST_RUN:
+        if n >= min_n:
+            break
+    else:
+        return np.nan, np.nan  # Too short
+    blocks = n // block
+    # A zero column separates the blocks, so every run ends at a zero
+    padded = np.zeros((blocks, block + 1), dtype=np.uint8)
+    padded[:, :block] = bits[: blocks * block].reshape(blocks, block)
+    zeros = np.flatnonzero(padded.ravel() == 0)
+    lengths = np.diff(zeros, prepend=-1) - 1
+    longest = np.zeros(blocks, dtype=np.int64)
+    np.maximum.at(longest, zeros // (block + 1), lengths)
+
+    observed = np.bincount(np.clip(longest, low, high) - low, minlength=high - low + 1)
+    expected = blocks * np.array(probs)
+    chi2 = (((observed - expected) ** 2) / expected).sum()
+    return chi2, gammaincc((len(probs) - 1) / 2, chi2 / 2)
+
+
+# Counts of every overlapping m-bit pattern, wrapping around the end
+def pattern_counts(bits: np.ndarray, m: int) -> np.ndarray:
+    if m == 0:
+        return np.array([len(bits)])
+    dtype = np.uint16 if m <= 16 else np.int64
+    ext = np.concatenate((bits, bits[: m - 1])).astype(dtype)
+    values = np.zeros(len(bits), dtype=dtype)
+    for j in range(m):
+        values = (values << 1) | ext[j : j + len(bits)]
+    return np.bincount(values, minlength=1 << m)
+
+
+@registry.plugin("test", input="bits")
+def serial(bits: np.ndarray, m: int = 3) -> tuple:
+    n = len(bits)
+
+    def psi2(k):
+        if k <= 0:
+            return 0.0
+        counts = pattern_counts(bits, k).astype(np.float64)
+        return (1 << k) / n * (counts**2).sum() - n
+
+    delta = psi2(m) - psi2(m - 1)
+    return delta, gammaincc(2 ** (m - 2), delta / 2)
+
+
+@registry.plugin("test", input="bits")
+def approximate_entropy(bits: np.ndarray, m: int = 2) -> tuple:
+    n = len(bits)
+
+    def phi(k):
+        c = pattern_counts(bits, k) / n
+        c = c[c > 0]
+        return (c * np.log(c)).sum()
+
+    apen = phi(m) - phi(m + 1)
+    chi2 = 2 * n * (math.log(2) - apen)
+    return chi2, gammaincc(2 ** (m - 1), chi2 / 2)
+
+
+@registry.plugin("test", input="bits")
+def cumulative_sums(bits: np.ndarray) -> tuple:
+    n = len(bits)
+    steps = 2 * bits.astype(np.int32) - 1
+    z = int(np.abs(np.cumsum(steps, dtype=np.int32 if n < 2**31 else np.int64)).max())
+    if z == 0:
+        return 0, 1.0
+    root = math.sqrt(n)
+    k = np.arange(int((-n / z + 1) / 4), int((n / z - 1) / 4) + 1)
+    p = 1 - (norm.cdf((4 * k + 1) * z / root) - norm.cdf((4 * k - 1) * z / root)).sum()
+    k = np.arange(int((-n / z - 3) / 4), int((n / z - 1) / 4) + 1)
+    p += (norm.cdf((4 * k + 3) * z / root) - norm.cdf((4 * k + 1) * z / root)).sum()
+    return z, min(max(p, 0.0), 1.0)
+
+
+@registry.plugin("test", input="bits")
+def spectral(bits: np.ndarray) -> tuple:
+    n = len(bits)
+    modulus = np.abs(np.fft.rfft(2.0 * bits - 1)[: n // 2])
+    threshold = math.sqrt(math.log(1 / 0.05) * n)
+    n0 = 0.95 * n / 2
+    n1 = np.count_nonzero(modulus < threshold)
+    d = (n1 - n0) / math.sqrt(n * 0.95 * 0.05 / 4)
+    return d, erfc(abs(d) / math.sqrt(2))
+
+
+@registry.plugin("test", input="uniform")
+def gap(x: np.ndarray, m: int, low: float = 0.0, high: float = 0.5, t: int = 10) -> tuple:
+    # Lengths of the gaps between successive values falling in [low, high).
+    # x takes the m + 1 values k / (m + 1), so p counts those in the interval
+    lo, hi = math.ceil(low * (m + 1)), math.ceil(high * (m + 1))
+    p = (hi - lo) / (m + 1)
+    k = (x * (m + 1)).round()
+    hits = np.flatnonzero((k >= lo) & (k < hi))
+    gaps = np.diff(hits) - 1
+    if len(gaps) == 0 or not 0 < p < 1:
+        return np.nan, np.nan
+    observed = np.bincount(np.minimum(gaps, t), minlength=t + 1)
+    probs = p * (1 - p) ** np.arange(t)
+    expected = len(gaps) * np.append(probs, (1 - p) ** t)
+    return chisquare(observed, expected)
+
+
+# Fewest days for which repeated spacings are close enough to Poisson
+BIRTHDAY_MIN_DAYS = 1 << 22
+
+
+@registry.plugin("test", input="integers")
+def birthday_spacings(values: np.ndarray, m: int, lam: float = 2.0) -> tuple:
+    # Birthdays are integers in [0, m] folded onto at most 2^24 days; the
+    # number of birthdays per sample is picked so repeated spacings between
+    # sorted birthdays are Poisson with mean lam per sample
+    if m + 1 < BIRTHDAY_MIN_DAYS:
+        return np.nan, np.nan  # The Poisson approximation does not hold
+    days = min(m + 1, 1 << 24)
+    birthdays = max(round((4 * lam * days) ** (1 / 3)), 2)
+    samples = len(values) // birthdays
+    if samples == 0:
+        return np.nan, np.nan
+    b = np.asarray(values[: samples * birthdays], dtype=np.int64)
+    if days < m + 1:
+        b = (b * (days / (m + 1))).astype(np.int64)
+    b = np.sort(b.reshape(samples, birthdays), axis=1)
+    spacings = np.sort(np.diff(b, axis=1), axis=1)
+    repeats = int(np.count_nonzero(spacings[:, 1:] == spacings[:, :-1]))
+    mean = samples * birthdays**3 / (4 * days)
+    p_value = 2 * min(poisson.cdf(repeats, mean), poisson.sf(repeats - 1, mean))
+    return repeats, min(p_value, 1.0)
+
+
+# Run the selected tests on numbers from [0, m], normalized to [0, 1)
+def run(names: list[str], x: np.ndarray, m: int, alpha: float) -> list[tuple]:
+    bits = None
+    results = []
+    for name in names:
+        func, kind = registry.load("test", name), registry.get("test", name).input
+        if kind == "bits":
+            if bits is None:
+                bits = to_bits(x, m)
+            stat, p_value = func(bits)
+        elif kind == "integers":
+            stat, p_value = func((x * (m + 1)).round().astype(np.uint64), m)
+        else:
+            stat, p_value = func(x, m)
+        results.append((name, float(stat), float(p_value), int(p_value < alpha)))
+    return results
@@ -0,0 +1,343 @@
+# Times a generator call with adaptive stopping
+# Repeated calls -> Mean time per call with a confidence interval
+#
+# Run as a script, it benchmarks every generator outside the sweep:
+#   python benchmark.py run       time the generators, append to the history
+#   python benchmark.py compare   flag regressions of a run against the baseline
+#   python benchmark.py baseline  make a run of the history the baseline
+
+import argparse
+import json
+import math
+import os
+import platform
+import statistics
+import subprocess
+import sys
+import time
+import tracemalloc
+from pathlib import Path
+from typing import Callable
+
+import numpy as np
+
+import registry
+import settings
+
+# One JSON object per run, appended
+HISTORY = f"{settings.RESULTS_DIR}/bench/history.jsonl"
+BASELINE = f"{settings.RESULTS_DIR}/bench/baseline.json"
+
+GROUPS = ("algo", "rejected", "extern")
+
+
+def measure(
+    func: Callable,
+    min_repeat: int = 5,
+    max_repeat: int = 100,
+    rel_ci: float = 0.05,
+    confidence: float = 0.95,
+    warmup: int = 0,
+) -> tuple:
+    """
+    Call func until the confidence interval on its mean time is tight.
+
+    :param func: Zero-argument callable to time.
+    :param min_repeat: Calls made before the stopping rule is checked.
+    :param max_repeat: Upper bound on the number of calls.
+    :param rel_ci: Stop once the CI half-width is below this fraction of the mean.
+    :param confidence: Confidence level of the interval.
+    :param warmup: Untimed calls made first (caches, lazy imports, builds).
+    :return: (output of the last call, timing dict with mean, ci, stdev,
+        min and runs)
+    """
+    for _ in range(warmup):
+        func()
+    z = statistics.NormalDist().inv_cdf((1 + confidence) / 2)
+    times = []
+    output = None
+    mean, half_width, stdev = 0.0, 0.0, 0.0
+    while len(times) < max(max_repeat, 1):
+        start = time.perf_counter()
+        output = func()
+        times.append(time.perf_counter() - start)
+
+        mean = statistics.fmean(times)
+        if len(times) >= 2:
+            stdev = statistics.stdev(times)
+            half_width = z * stdev / math.sqrt(len(times))
+        if len(times) >= min_repeat and half_width <= rel_ci * mean:
+            break
+
+    timing = {"mean": mean, "ci": half_width, "stdev": stdev, "min": min(times)}
+    return output, {**timing, "runs": len(times)}
+
+
+# Peak bytes allocated by one call of func, as seen by tracemalloc (NumPy
+# buffers included; memory of external processes is not)
+def peak_memory(func: Callable) -> int:
+    tracemalloc.start()
+    try:
+        func()
+        return tracemalloc.get_traced_memory()[1]
+    finally:
+        tracemalloc.stop()
+
+
+def targets(groups=GROUPS, m: int = 10**9, a: int = 5) -> dict[str, tuple]:
+    """
+    Generators to benchmark, as name -> (group, func) with func(n) drawing
+    n numbers:
+
+        algo       every algorithm of the default sweep (with its backend
+                   if listed in VECTORIZE), called as (m, n, a)
+        rejected   the variants in algos/rejected.py, called as (m, n, a),
+                   or as (m, n, 0) if they scale a themselves (a = 5 * 10^0)
+        extern     the external programs, sampled from their workers
+    """
+    found = {}
+    if "algo" in groups:
+        for key in registry.names("algorithm", "sweep"):
+            func = registry.load("algorithm", key, vectorized=key in settings.VECTORIZE)
+            found[key] = ("algo", lambda n, func=func: func(m, n, a))
+    if "rejected" in groups:
+        for entry in registry.entries("algorithm", "rejected"):
+            func = registry.load("algorithm", entry.name)
+            arg = 0 if entry.exponent else a
+            found[entry.name] = ("rejected", lambda n, func=func, arg=arg: func(m, n, arg))
+    if "extern" in groups:
+        import extern.workers as workers
+
+        def sample(n, name):
+            data = workers.collect(n, [name])
+            if name in data.failures:
+                raise RuntimeError(str(data.failures[name]))
+            return data.samples[name]
+
+        for name in registry.names("extern"):
+            found[name] = ("extern", lambda n, name=name: sample(n, name))
+    return found
+
+
+def machine() -> dict:
+    # Hardware and software the numbers were measured on
+    info = {
+        "host": platform.node(),
+        "platform": platform.platform(),
+        "machine": platform.machine(),
+        "cpu": platform.processor(),
+        "cpus": os.cpu_count(),
+        "python": platform.python_version(),
+        "numpy": np.__version__,
+    }
+    try:
+        with open("/proc/cpuinfo") as f:
+            info["cpu"] = next(
+                line.split(":", 1)[1].strip() for line in f if line.startswith("model name")
+            )
+    except (OSError, StopIteration):
+        pass
+    return info
+
+
+# Commit of the code measured, or None outside a git checkout
+def commit() -> str:
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"], capture_output=True, text=True, check=True
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def bench(
+    func: Callable,
+    n: int,
+    warmup: int = 2,
+    min_repeat: int = 5,
+    max_repeat: int = 50,
+    rel_ci: float = 0.05,
+) -> dict:
+    # Timing and memory of drawing n numbers with func(n)
+    _, timing = measure(lambda: func(n), min_repeat, max_repeat, rel_ci, warmup=warmup)
+    return {
+        "n": n,
+        "mean_s": timing["mean"],
+        "ci_s": timing["ci"],
+        "stdev_s": timing["stdev"],
+        "min_s": timing["min"],
+        "runs": timing["runs"],
+        "ns_per_sample": timing["mean"] / n * 1e9,
+        "ns_per_sample_ci": timing["ci"] / n * 1e9,
+        "samples_per_s": n / timing["mean"],
+        "peak_bytes": peak_memory(lambda: func(n)),
+    }
+
+
+def run(
+    sizes: list[int],
+    groups=GROUPS,
+    names: list[str] = None,
+    m: int = 10**9,
+    **options,
+) -> dict:
+    """
+    Benchmark the targets one at a time in this process, at every size.
+
+    :param names: Targets to run (default: all of the groups).
+    :param options: warmup, min_repeat, max_repeat and rel_ci of bench().
+    :return: Run record with the machine, settings and one result per
+        (target, n); a target that fails gets an "error" result instead.
+    """
+    results = []
+    for name, (group, func) in targets(groups, m).items():
+        if names and name not in names:
+            continue
+        for n in sizes:
+            print(f"{name:36} n = {n:<10}", end=" ", flush=True)
+            try:
+                result = bench(func, n, **options)
+            except Exception as e:
+                print(f"failed: {e}")
+                results.append({"target": name, "group": group, "n": n, "error": str(e)})
+                break
+            print(
+                f"{result['ns_per_sample']:12.1f} ns/sample "
+                f"± {result['ns_per_sample_ci']:.1f}  ({result['runs']} runs)"
+            )
+            results.append({"target": name, "group": group, **result})
+    return {
+        "time": time.strftime("%Y-%m-%dT%H:%M:%S%z"),
+        "commit": commit(),
+        "machine": machine(),
+        "settings": {"m": m, "sizes": sizes, **options},
+        "results": results,
+    }
+
+
+def load_history(path: str = HISTORY) -> list[dict]:
+    if not os.path.exists(path):
+        return []
+    with open(path) as f:
+        return [json.loads(line) for line in f if line.strip()]
+
+
+def append_history(record: dict, path: str = HISTORY) -> None:
+    Path(path).parent.mkdir(parents=True, exist_ok=True)
+    with open(path, "a") as f:
+        f.write(json.dumps(record) + "\n")
+
+
+def save_baseline(record: dict, path: str = BASELINE) -> None:
+    Path(path).parent.mkdir(parents=True, exist_ok=True)
+    with open(path, "w") as f:
+        json.dump(record, f, indent=1)
+
+
+def compare(current: dict, baseline: dict, threshold: float = 0.10) -> list[dict]:
+    """
+    Match the results of two runs by (target, n).
+
+    A result regressed when it is more than `threshold` slower per sample
+    than the baseline and the confidence intervals do not overlap, so noise
+    within the intervals is never flagged.
+    """
+    base = {(r["target"], r["n"]): r for r in baseline["results"] if "error" not in r}
+    rows = []
+    for r in current["results"]:
+        old = base.get((r["target"], r["n"]))
+        if old is None or "error" in r:
+            continue
+        change = r["ns_per_sample"] / old["ns_per_sample"] - 1
+        apart = (
+            r["ns_per_sample"] - r["ns_per_sample_ci"]
+            > old["ns_per_sample"] + old["ns_per_sample_ci"]
+        )
+        rows.append(
+            {
+                "target": r["target"],
+                "n": r["n"],
+                "baseline": old["ns_per_sample"],
+                "current": r["ns_per_sample"],
+                "change": change,
+                "regressed": change > threshold and apart,
+            }
+        )
+    return rows
+
+
+def main(argv: list[str] = None) -> int:
+    parser = argparse.ArgumentParser(description="Benchmark the generators.")
+    parser.add_argument("--history", default=HISTORY, help="JSON Lines file of runs")
+    parser.add_argument("--baseline-file", default=BASELINE, help="run compared against")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    p = commands.add_parser("run", help="benchmark and append the run to the history")
+    p.add_argument("--n", nargs="+", type=int, default=[1000, 10000, 100000], help="sample sizes")
+    p.add_argument("--m", type=int, default=10**9, help="modulus m")
+    p.add_argument("--groups", nargs="+", choices=GROUPS, default=list(GROUPS))
+    p.add_argument("--targets", nargs="+", help="only these targets (e.g. pcg rejected.xor_hprng C)")
+    p.add_argument("--warmup", type=int, default=2, help="untimed calls per size")
+    p.add_argument("--min-repeat", type=int, default=5)
+    p.add_argument("--max-repeat", type=int, default=50)
+    p.add_argument("--rel-ci", type=float, default=0.05)
+    p.add_argument("--baseline", action="store_true", help="also make this run the baseline")
+
+    p = commands.add_parser("compare", help="flag regressions against the baseline")
+    p.add_argument("--run", type=int, default=-1, help="index of the run in the history (default: last)")
+    p.add_argument("--threshold", type=float, default=0.10, help="slowdown flagged (default 10%%)")
+
+    p = commands.add_parser("baseline", help="make a run of the history the baseline")
+    p.add_argument("--run", type=int, default=-1, help="index of the run in the history (default: last)")
+
+    args = parser.parse_args(argv)
+
+    if args.command == "run":
+        record = run(
+            args.n,
+            args.groups,
+            args.targets,
+            args.m,
+            warmup=args.warmup,
+            min_repeat=args.min_repeat,
+            max_repeat=args.max_repeat,
+            rel_ci=args.rel_ci,
+        )
+        append_history(record, args.history)
+        if args.baseline:
+            save_baseline(record, args.baseline_file)
+        return 0
+
+    history = load_history(args.history)
+    if not history:
+        sys.exit(f"No runs in {args.history}; benchmark with `python benchmark.py run` first")
+    record = history[args.run]
+    if args.command == "baseline":
+        save_baseline(record, args.baseline_file)
+        print(f"Baseline set to the run of {record['time']}")
+        return 0
+
+    if not os.path.exists(args.baseline_file):
+        sys.exit(f"No baseline in {args.baseline_file}; set one with `python benchmark.py baseline`")
+    with open(args.baseline_file) as f:
+        baseline = json.load(f)
+    rows = compare(record, baseline, args.threshold)
+    print(
+        f"Run of {record['time']} ({record['commit']}) against the baseline "
+        f"of {baseline['time']} ({baseline['commit']})"
+    )
+    if record["machine"] != baseline["machine"]:
+        print("Warning: the runs were made on different machines")
+    for row in rows:
+        flag = "REGRESSION" if row["regressed"] else ""
+        print(
+            f"{row['target']:36} n = {row['n']:<10} {row['baseline']:12.1f} -> "
+            f"{row['current']:12.1f} ns/sample {row['change']:+8.1%}  {flag}"
+        )
+    regressions = sum(row["regressed"] for row in rows)
+    print(f"{regressions} regression(s) in {len(rows)} comparisons")
+    return 1 if regressions else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -1,12 +1,83 @@
-# Generates Binary Data File from an array of random numbers [0 < num < 1]
-# Array -> Binary -> Binary File
+# Generates packed binary data files from random numbers
+# Numbers -> Bits or full words -> Packed binary file, written in chunks
 
+from typing import Iterable
 
-def convert_to_bin(random_nums: list[float]) -> str:
-    return "".join([str(round(num)) for num in random_nums])
+import numpy as np
 
 
-def generate_binary_file(path: str, data: list[float]):
-    with open(path, "wb") as f:
-        bin = convert_to_bin(data)
-        f.write(bin.encode("utf-8"))
+# One bit per number in [0, 1): 1 above 0.5, 0 otherwise (as round(num))
+def threshold_bits(random_nums) -> np.ndarray:
+    return (np.asarray(random_nums) > 0.5).astype(np.uint8)
+
+
+# Big-endian bytes of integer words, `width` bits each (default: the dtype's)
+def word_bytes(words, width: int = None) -> bytes:
+    words = np.asarray(words)
+    width = width or words.dtype.itemsize * 8
+    return words.astype(f">u{width // 8}", copy=False).tobytes()
+
+
+class BinaryWriter:
+    """
+    Writes bits packed eight to a byte (MSB first) or whole words to a file.
+
+    Bits that do not fill a byte are carried over to the next write, so a
+    stream written in chunks is byte-identical to one written at once. The
+    last partial byte is padded with zeros on close.
+    """
+
+    def __init__(self, path: str):
+        self.file = open(path, "wb")
+        self.tail = np.empty(0, dtype=np.uint8)
+
+    def write_bits(self, bits) -> None:
+        bits = np.asarray(bits, dtype=np.uint8)
+        if len(self.tail):
+            bits = np.concatenate((self.tail, bits))
+        full = len(bits) - len(bits) % 8
+        self.file.write(np.packbits(bits[:full]).tobytes())
+        self.tail = bits[full:].copy()
+
+    def write_words(self, words, width: int = None) -> None:
+        if len(self.tail):
+            raise ValueError("words must start on a byte boundary")
+        self.file.write(word_bytes(words, width))
+
+    def close(self) -> None:
+        if len(self.tail):
+            self.file.write(np.packbits(self.tail).tobytes())
+            self.tail = self.tail[:0]
+        self.file.close()
+
+    def __enter__(self) -> "BinaryWriter":
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.close()
+
+
+def write_bits(path: str, chunks: Iterable) -> None:
+    with BinaryWriter(path) as writer:
+        for bits in chunks:
+            writer.write_bits(bits)
+
+
+def write_words(path: str, chunks: Iterable, width: int = None) -> None:
+    with BinaryWriter(path) as writer:
+        for words in chunks:
+            writer.write_words(words, width)
+
+
+# Thresholded bits of numbers in [0, 1), one per number
+def generate_binary_file(path: str, data) -> None:
+    write_bits(path, [threshold_bits(data)])
+
+
+# n full 32/64-bit output words of a generator (see algos/generators.py),
+# drawn and written `chunk` words at a time
+def generate_word_file(path: str, source, n: int, chunk: int = 1 << 20) -> None:
+    write_words(
+        path,
+        (source.next_block(min(chunk, n - i)) for i in range(0, n, chunk)),
+    )
@@ -0,0 +1,143 @@
+# Content-addressed store of sweep cell results
+# (code hash, parameters) -> Key -> Statistics and samples, LRU-bounded on disk
+
+import hashlib
+import inspect
+import json
+import pickle
+import sys
+import time
+from functools import partial
+from pathlib import Path
+
+import numpy as np
+
+import dbconn as db
+
+ROOT = Path(__file__).resolve().parent
+
+# Bump to invalidate every entry when the stored layout changes
+CACHE_VERSION = 1
+
+
+# Project modules (files under ROOT) that obj depends on, by module name
+def _modules(obj) -> dict[str, Path]:
+    found = {}
+    stack = [obj]
+    while stack:
+        obj = stack.pop()
+        while isinstance(obj, partial):
+            obj = obj.func
+        module = obj if inspect.ismodule(obj) else sys.modules.get(
+            getattr(obj, "__module__", None) or ""
+        )
+        path = getattr(module, "__file__", None)
+        if path is None or module.__name__ in found:
+            continue
+        path = Path(path).resolve()
+        if ROOT not in path.parents:
+            continue  # Standard library or an installed package
+        found[module.__name__] = path
+        stack.extend(
+            value
+            for value in vars(module).values()
+            if inspect.ismodule(value) or inspect.isfunction(value) or inspect.isclass(value)
+        )
+    return found
+
+
+def code_hash(*objects) -> str:
+    # Hash of the source of every project module the objects import, directly
+    # or not, so editing a generator (or a test) only invalidates its cells.
+    modules = {}
+    for obj in objects:
+        modules.update(_modules(obj))
+    digest = hashlib.sha256()
+    for name in sorted(modules):
+        digest.update(name.encode())
+        digest.update(modules[name].read_bytes())
+    return digest.hexdigest()
+
+
+def cell_key(code: str, params: dict) -> str:
+    blob = json.dumps([CACHE_VERSION, code, params], sort_keys=True, default=str)
+    return hashlib.sha256(blob.encode()).hexdigest()
+
+
+class ResultCache:
+    """
+    Statistics of sweep cells by key, with their samples optionally, in a
+    SQLite file of at most `max_bytes` of payload.
+
+    Reads refresh an entry's last use; writes evict the least recently used
+    entries until the store fits again. Only the process running the sweep
+    should hold it open.
+    """
+
+    def __init__(self, path: str, max_bytes: int, compress: bool = False):
+        self.conn = db.connect(path)
+        self.max_bytes = max_bytes
+        self.compress = compress
+        self.conn.execute("""CREATE TABLE IF NOT EXISTS Entries (
+            KEY TEXT PRIMARY KEY,            -- cell_key() of the cell
+            STATS BLOB          NOT NULL,    -- Pickled statistics without the samples
+            NUMBERS BLOB,                    -- Samples (see dbconn.encode_numbers), or NULL
+            FORMAT TEXT,                     -- Encoding of NUMBERS
+            SIZE INT            NOT NULL,    -- Bytes of STATS and NUMBERS
+            USED FLOAT          NOT NULL     -- Time of the last read or write
+        );""")
+        self.conn.execute("CREATE INDEX IF NOT EXISTS idx_used ON Entries (USED)")
+        self.conn.commit()
+
+    def get(self, key: str) -> dict:
+        # Statistics stored under key (numbers empty when not stored), or None
+        row = self.conn.execute(
+            "SELECT STATS, NUMBERS, FORMAT FROM Entries WHERE KEY = ?", (key,)
+        ).fetchone()
+        if row is None:
+            return None
+        with self.conn:
+            self.conn.execute("UPDATE Entries SET USED = ? WHERE KEY = ?", (time.time(), key))
+        stats = pickle.loads(row[0])
+        if row[1] is None:
+            stats["numbers"] = np.empty(0)
+        else:
+            stats["numbers"] = db.decode_numbers(row[1], row[2])
+        return stats
+
+    def put(self, key: str, stats: dict, samples: bool = True) -> None:
+        blob = pickle.dumps({k: v for k, v in stats.items() if k != "numbers"})
+        numbers, fmt = None, None
+        if samples and len(stats["numbers"]):
+            numbers, fmt = db.encode_numbers(stats["numbers"], self.compress)
+        size = len(blob) + len(numbers or b"")
+        if size > self.max_bytes:
+            return  # Would evict everything else and still not fit
+        with self.conn:
+            self.conn.execute(
+                "INSERT OR REPLACE INTO Entries VALUES (?, ?, ?, ?, ?, ?)",
+                (key, blob, numbers, fmt, size, time.time()),
+            )
+        self.evict()
+
+    def evict(self) -> None:
+        (total,) = self.conn.execute("SELECT COALESCE(SUM(SIZE), 0) FROM Entries").fetchone()
+        if total <= self.max_bytes:
+            return
+        stale = []
+        for key, size in self.conn.execute("SELECT KEY, SIZE FROM Entries ORDER BY USED"):
+            stale.append((key,))
+            total -= size
+            if total <= self.max_bytes:
+                break
+        with self.conn:
+            self.conn.executemany("DELETE FROM Entries WHERE KEY = ?", stale)
+
+    def close(self) -> None:
+        self.conn.close()
+
+    def __enter__(self) -> "ResultCache":
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.close()
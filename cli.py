@@ -0,0 +1,113 @@
+# Command line and TOML settings of a sweep
+# argv / TOML file -> Settings with explicit grids over m, N, a, w and algorithms
+
+import argparse
+import tomllib
+
+# Settings a TOML file may give in its [sweep] table; the command line
+# overrides the file and the file overrides the prompts and env.config
+KEYS = (
+    "threads", "workers", "algos", "m", "n", "a", "w",
+    "binary", "headless", "plots", "resume", "profile",
+)
+
+
+# start, start * factor, ... up to stop
+def geometric(start, stop, factor, kind=int) -> list:
+    if factor <= 1:
+        raise ValueError(f"factor of a geometric grid must exceed 1, got {factor}")
+    values = []
+    value = start
+    while value <= stop:
+        values.append(kind(value))
+        value *= factor
+    return values
+
+
+def _number(token, kind):
+    try:
+        return kind(token)
+    except ValueError:
+        return kind(float(token))  # 1e11 for an int
+
+
+def grid(value, kind=int) -> list:
+    """
+    Expand a grid given as a number, a "start:stop:factor" string, a
+    {start, stop, factor} table or a list of any of these.
+
+    :return: List of values, or None when value is None.
+    """
+    if value is None:
+        return None
+    if isinstance(value, dict):
+        return geometric(
+            _number(value["start"], kind), _number(value["stop"], kind),
+            _number(value["factor"], kind), kind,
+        )
+    if isinstance(value, (list, tuple)):
+        return [item for part in value for item in grid(part, kind)]
+    if isinstance(value, str) and ":" in value:
+        start, stop, factor = value.split(":")
+        return geometric(
+            _number(start, kind), _number(stop, kind), _number(factor, kind), kind
+        )
+    return [_number(value, kind)]
+
+
+def parser() -> argparse.ArgumentParser:
+    p = argparse.ArgumentParser(
+        description="Run the PRNG test sweep over the Cartesian product of the grids.",
+        epilog='Grid values are numbers or geometric ranges "start:stop:factor", '
+        'e.g. --m 100:1e11:10.',
+    )
+    p.add_argument("--config", help="TOML file with a [sweep] table of these settings")
+    p.add_argument("--threads", type=int, help="independent data sets per cell")
+    p.add_argument("--workers", type=int, help="worker processes (default: all cores)")
+    p.add_argument("--algos", nargs="+", help='algorithm keys (see `python registry.py`), "extern" for the external programs')
+    p.add_argument("--m", nargs="+", help="modulus grid (default: M_INITIAL * M_MULTIPLIER^k up to M_LIMIT)")
+    p.add_argument("--n", nargs="+", help="sample size grid (default: N)")
+    p.add_argument("--a", nargs="+", help="multiplier grid of the hybrids (default: 5 * 10^thread)")
+    p.add_argument("--w", nargs="+", help="reseed period grid, as a fraction of m (default: each algorithm's)")
+    p.add_argument("--binary", action=argparse.BooleanOptionalAction, help="write binary files")
+    p.add_argument(
+        "--headless",
+        action=argparse.BooleanOptionalAction,
+        help="never prompt; save the plots to PLOT_DIR instead of showing them",
+    )
+    p.add_argument("--plots", nargs="+", type=int, help="plots to draw (see visualize.get_selection)")
+    p.add_argument("--resume", action="store_true", default=None, help="continue an interrupted sweep")
+    p.add_argument(
+        "--profile",
+        nargs="?",
+        const="time",
+        choices=["time", "alloc"],
+        help="record per-stage timing to PROFILE_DIR (alloc: also bytes, slower)",
+    )
+    return p
+
+
+def load(argv: list[str] = None) -> argparse.Namespace:
+    """
+    Settings from the command line over those of the --config TOML file.
+
+    Settings given by neither are None. Grids come back expanded to lists:
+    m, n and a of ints, w of floats.
+    """
+    args = parser().parse_args(argv)
+    settings = dict.fromkeys(KEYS)
+    if args.config:
+        with open(args.config, "rb") as f:
+            table = tomllib.load(f)
+        table = table.get("sweep", table)
+        unknown = set(table) - set(KEYS)
+        if unknown:
+            raise SystemExit(f"Unknown settings in {args.config}: {', '.join(sorted(unknown))}")
+        settings.update(table)
+    settings.update({key: value for key, value in vars(args).items() if value is not None})
+    for key in ("m", "n", "a"):
+        settings[key] = grid(settings[key])
+    settings["w"] = grid(settings["w"], float)
+    if isinstance(settings["algos"], str):
+        settings["algos"] = settings["algos"].split(",")
+    return argparse.Namespace(**{key: settings[key] for key in KEYS})
@@ -1,41 +1,24 @@
-import json
 import pandas as pd
 import seaborn as sns
 import matplotlib.pyplot as plt
-import numpy as np
-import sqlite3 as sq
-from visualize import fetch_data
 
+import query as qry
+import visualize as vis
 
-def get_rejections(algo: str, path: str) -> tuple:
-    """Fetch rejection counts for KS and Chi-squared tests."""
-    ks_reject, chi_reject, total, exec_time = 0, 0, 0, 0
-    rows = fetch_data(algo, path, ["CHI_REJECTED", "KS_REJECTED", "TIME"])
 
-    for row in rows:
-        ks_reject += row["KS_REJECTED"]
-        chi_reject += row["CHI_REJECTED"]
-        exec_time += row["TIME"]
-        total += 1
-
-    return ks_reject, chi_reject, exec_time, total
-
-
-def main(threads: int, algo_list: list[str], base: str) -> None:
+def main(algo_list: list[str], path: str) -> None:
     """Calculate rejection rates and visualize results."""
     data = {name: {"chi": 0, "ks": 0, "total": 0, "time": 0} for name in algo_list}
 
-    for i in range(threads):
-        path = f"{base}/test_{i}.db"
-        for name in algo_list:
-            try:
-                ks, chi, exec_time, total = get_rejections(name, path)
-                data[name]["chi"] += chi
-                data[name]["ks"] += ks
-                data[name]["time"] += exec_time
-                data[name]["total"] += total
-            except Exception:
-                pass
+    # Rows of every thread live in the same database; sum them in one query
+    totals = qry.rejections(path)
+    for name in algo_list:
+        if name in totals.index:
+            row = totals.loc[name]
+            data[name]["chi"] = int(row["CHI"])
+            data[name]["ks"] = int(row["KS"])
+            data[name]["time"] = float(row["TIME"])
+            data[name]["total"] = int(row["TOTAL"])
 
     print("Rejection Rates:")
     algo_names, chi_rates, ks_rates = [], [], []
@@ -50,6 +33,14 @@ def main(threads: int, algo_list: list[str], base: str) -> None:
             f"{name}\t:\tChi^2 = {chi_rate:03.2f}%;\tKS = {ks_rate:03.2f}%;\t[{values['chi']:04}:{values['ks']:04}:{values['total']}]\tExec. time: {exec_time}"
         )
 
+    # Rejection rates of the extended battery, one column per test
+    extended = qry.battery(path)
+    if len(extended):
+        extended["RATE"] = extended["REJECTED"] / extended["TOTAL"] * 100
+        table = extended.pivot(index="ALGO", columns="TEST", values="RATE")
+        print("\nBattery Rejection Rates (%):")
+        print(table.reindex([name for name in algo_list if name in table.index]).round(2))
+
     df = pd.DataFrame(
         {
             "Algorithm": algo_names,
@@ -68,25 +59,25 @@ def main(threads: int, algo_list: list[str], base: str) -> None:
     plt.xlabel("Algorithm")
     plt.xticks(rotation=45)
     plt.legend(title="Test Type")
-    plt.show()
+    vis.show("rejection_rates")
 
 
 # Entry point for the program
 if __name__ == "__main__":
-    from test import algo_list, RESULTS_DIR, DB_DIR
+    import argparse
+
+    import registry
+    from settings import RESULTS_DB, RESULTS_DIR, PLOT_DIR
+
+    parser = argparse.ArgumentParser(description="Print and plot the rejection rates.")
+    parser.add_argument("--headless", action="store_true", help="save the plot to PLOT_DIR")
+    if parser.parse_args().headless:
+        vis.headless(RESULTS_DIR + PLOT_DIR)
 
-    algs = list(algo_list.keys()) + [
-        "C",
-        "C++",
-        "Rust",
-        "JS",
-        "Java",
-        "PHP",
-    ]
+    algs = registry.names("algorithm", "sweep") + registry.names("extern")
 
-    threads = int(input("Thread: "))
     try:
-        main(threads, algs, RESULTS_DIR + DB_DIR)
+        main(algs, RESULTS_DB)
     except KeyboardInterrupt:
         print("\n\nExiting tests...")
 
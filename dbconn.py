@@ -1,14 +1,76 @@
 import json
 import sqlite3 as sq
+import uuid
+import zlib
+from pathlib import Path
 
+import numpy as np
 
-def generate_entry(stats: dict, algo: str, m: int, n: int, alpha: float) -> dict:
+import profiling as prof
+
+
+# Encode numbers for the RAND_NUMS column. Returns (value, RAND_FORMAT):
+#   "<f8" / "<u8"   raw little-endian float64 / uint64 BLOB
+#   "...+zlib"      the same, zlib-compressed
+#   "npy"           path of a sidecar .npy file written to sidecar_dir
+def encode_numbers(
+    numbers, compress: bool = False, sidecar_dir: str = None
+) -> tuple:
+    arr = np.asarray(numbers)
+    arr = arr.astype("<u8" if arr.dtype.kind in "ui" else "<f8", copy=False)
+    if sidecar_dir is not None:
+        path = Path(sidecar_dir) / f"{uuid.uuid4().hex}.npy"
+        np.save(path, arr)
+        return str(path), "npy"
+    if compress:
+        return zlib.compress(arr.tobytes(), 1), arr.dtype.str + "+zlib"
+    return arr.tobytes(), arr.dtype.str
+
+
+# Decode a RAND_NUMS value. Raw BLOBs come back as a zero-copy read-only
+# view and sidecar files memory-mapped; rows written before RAND_FORMAT
+# existed hold JSON text.
+def decode_numbers(value, fmt: str = None) -> np.ndarray:
+    if fmt is None or fmt == "json":
+        return np.array(json.loads(value))
+    if fmt == "npy":
+        return np.load(value, mmap_mode="r")
+    dtype, _, codec = fmt.partition("+")
+    if codec == "zlib":
+        value = zlib.decompress(value)
+    return np.frombuffer(value, dtype=dtype)
+
+
+# A is stored as decimal text: a = 5 * 10^thread outgrows SQLite's 64-bit
+# INT from thread 19 on
+def a_text(a: int) -> str:
+    return None if a is None else str(a)
+
+
+def generate_entry(
+    stats: dict,
+    algo: str,
+    m: int,
+    n: int,
+    alpha: float,
+    compress: bool = False,
+    sidecar_dir: str = None,
+    thread: int = 0,
+    a: int = None,
+    w: float = None,
+) -> dict:
+    with prof.stage("db.encode"):
+        rand_nums, rand_format = encode_numbers(stats["numbers"], compress, sidecar_dir)
     return {
+        "THREAD": thread,
         "ALGO": algo,
         "M": m,
         "N": n,
+        "A": a_text(a),
+        "W": w,
         "ALPHA": alpha,
-        "RAND_NUMS": json.dumps(stats["numbers"]),
+        "RAND_NUMS": rand_nums,
+        "RAND_FORMAT": rand_format,
         "D_STAT": stats["ks"][0],
         "KS_P_VALUE": stats["ks"][1],
         "KS_REJECTED": stats["ks"][2],
@@ -16,37 +78,139 @@ def generate_entry(stats: dict, algo: str, m: int, n: int, alpha: float) -> dict
         "CHI_P_VALUE": stats["chi"][1],
         "CHI_REJECTED": stats["chi"][2],
         "TIME": stats["time"],
+        "BATTERY": stats.get("battery", []),
     }
 
 
+COLUMNS = (
+    "THREAD",
+    "ALGO",
+    "M",
+    "N",
+    "A",
+    "W",
+    "ALPHA",
+    "RAND_NUMS",
+    "RAND_FORMAT",
+    "D_STAT",
+    "CHI_2_STAT",
+    "KS_P_VALUE",
+    "KS_REJECTED",
+    "CHI_P_VALUE",
+    "CHI_REJECTED",
+    "TIME",
+)
+INSERT = f"INSERT INTO RandomnessTests ({', '.join(COLUMNS)}) VALUES ({', '.join('?' * len(COLUMNS))})"
+
+
+BATTERY_COLUMNS = ("THREAD", "ALGO", "M", "N", "A", "W", "TEST", "STAT", "P_VALUE", "REJECTED")
+BATTERY_INSERT = f"INSERT INTO BatteryTests ({', '.join(BATTERY_COLUMNS)}) VALUES ({', '.join('?' * len(BATTERY_COLUMNS))})"
+
+
+# Sweep cells (THREAD, CELL, M, N, A, W) whose rows are all in the database;
+# CELL is the algorithm key, or the task name of a cell producing several
+# algorithms
+JOURNAL_INSERT = "INSERT INTO Journal (THREAD, CELL, M, N, A, W) VALUES (?, ?, ?, ?, ?, ?)"
+
+
+def row_values(stat: dict) -> tuple:
+    return tuple(stat[column] for column in COLUMNS)
+
+
+# One BatteryTests row per (test, statistic, p-value, rejected) result
+def battery_values(stat: dict) -> list[tuple]:
+    key = tuple(stat[column] for column in BATTERY_COLUMNS[:6])
+    return [key + tuple(result) for result in stat.get("BATTERY", [])]
+
+
+def connect(path: str) -> sq.Connection:
+    # WAL lets readers run during a sweep; with synchronous=NORMAL a commit
+    # no longer waits for an fsync of the database file.
+    conn = sq.connect(path)
+    conn.execute("PRAGMA journal_mode=WAL")
+    conn.execute("PRAGMA synchronous=NORMAL")
+    conn.execute("PRAGMA cache_size=-65536")  # 64 MiB page cache
+    conn.execute("PRAGMA temp_store=MEMORY")
+    return conn
+
+
 def enter_values(stat: dict, conn: sq.Connection):
-    conn.execute(
-        "INSERT INTO RandomnessTests (ALGO, M, N, ALPHA, RAND_NUMS, D_STAT, CHI_2_STAT, KS_P_VALUE, KS_REJECTED, CHI_P_VALUE, CHI_REJECTED, TIME) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)",
-        (
-            stat["ALGO"],
-            stat["M"],
-            stat["N"],
-            stat["ALPHA"],
-            stat["RAND_NUMS"],
-            stat["D_STAT"],
-            stat["CHI_2_STAT"],
-            stat["KS_P_VALUE"],
-            stat["KS_REJECTED"],
-            stat["CHI_P_VALUE"],
-            stat["CHI_REJECTED"],
-            stat["TIME"],
-        ),
-    )
+    conn.execute(INSERT, row_values(stat))
+    conn.executemany(BATTERY_INSERT, battery_values(stat))
     conn.commit()
 
 
+class ResultWriter:
+    """
+    Buffers result rows and inserts them with executemany, committing once
+    every `commit_every` rows instead of once per row.
+
+    Use as a context manager so the last partial batch is flushed; rows from
+    many workers can be fed through a queue with consume().
+    """
+
+    def __init__(self, conn: sq.Connection, commit_every: int = 50):
+        self.conn = conn
+        self.commit_every = max(commit_every, 1)
+        self.rows = []
+        self.battery_rows = []
+        self.journal_rows = []
+
+    def _append(self, stat: dict) -> None:
+        self.rows.append(row_values(stat))
+        self.battery_rows.extend(battery_values(stat))
+
+    def add(self, stat: dict) -> None:
+        self._append(stat)
+        if len(self.rows) >= self.commit_every:
+            self.flush()
+
+    def add_cell(self, stats: list[dict], cell: tuple) -> None:
+        # All rows of one sweep cell and its Journal entry (THREAD, CELL, M,
+        # N, A, W) go into the same batch, so an interrupted sweep never leaves a
+        # cell half written.
+        for stat in stats:
+            self._append(stat)
+        thread, key, m, n, a, w = cell
+        self.journal_rows.append((thread, key, m, n, a_text(a), w))
+        if len(self.rows) >= self.commit_every:
+            self.flush()
+
+    def flush(self) -> None:
+        if self.rows or self.journal_rows:
+            with prof.stage("db.commit", rows=len(self.rows)), self.conn:  # One transaction per batch
+                self.conn.executemany(INSERT, self.rows)
+                self.conn.executemany(BATTERY_INSERT, self.battery_rows)
+                self.conn.executemany(JOURNAL_INSERT, self.journal_rows)
+            self.rows = []
+            self.battery_rows = []
+            self.journal_rows = []
+
+    def consume(self, queue, sentinel=None) -> None:
+        # Write entries from a queue.Queue / multiprocessing.Queue until the
+        # sentinel arrives.
+        for stat in iter(queue.get, sentinel):
+            self.add(stat)
+        self.flush()
+
+    def __enter__(self) -> "ResultWriter":
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.flush()
+
+
 def setup_table(conn: sq.Connection):
     conn.execute("""CREATE TABLE RandomnessTests (
+        THREAD INT          NOT NULL DEFAULT 0, -- Index of the data set (thread) the row belongs to
         ALGO CHAR(50)       NOT NULL,        -- Algorithm name
         M INT               NOT NULL,        -- Parameter m (integer)
         N INT               NOT NULL,        -- Parameter n (integer)
+        A TEXT,                              -- Multiplier a of a hybrid, decimal (NULL if unused)
+        W FLOAT,                             -- Reseed period w of a hybrid (NULL if unused)
         ALPHA FLOAT         NOT NULL,        -- Alpha value (significance level)
-        RAND_NUMS TEXT      NOT NULL,        -- Generated random numbers (stored as a JSON array)
+        RAND_NUMS BLOB      NOT NULL,        -- Generated random numbers (see encode_numbers)
+        RAND_FORMAT TEXT    NOT NULL,        -- Encoding of RAND_NUMS ("<f8", "<f8+zlib", "npy", ...)
         D_STAT FLOAT,                        -- K-S Test D statistic (nullable)
         CHI_2_STAT FLOAT,                    -- Chi-Square Test statistic (nullable)
         KS_P_VALUE FLOAT    NOT NULL,        -- p-value of the K-S test
@@ -56,4 +220,53 @@ def setup_table(conn: sq.Connection):
         TIME FLOAT          NOT NULL,        -- Time taken to run the function
         TIMESTAMP DATETIME DEFAULT CURRENT_TIMESTAMP -- Timestamp on row creation
     );""")
+    conn.execute("""CREATE TABLE BatteryTests (
+        THREAD INT          NOT NULL DEFAULT 0, -- Index of the data set (thread) the row belongs to
+        ALGO CHAR(50)       NOT NULL,        -- Algorithm name
+        M INT               NOT NULL,        -- Parameter m (integer)
+        N INT               NOT NULL,        -- Parameter n (integer)
+        A TEXT,                              -- Multiplier a of a hybrid, decimal (NULL if unused)
+        W FLOAT,                             -- Reseed period w of a hybrid (NULL if unused)
+        TEST TEXT           NOT NULL,        -- Name of the test in the registry
+        STAT FLOAT,                          -- Test statistic (nullable)
+        P_VALUE FLOAT,                       -- p-value (NULL when the sample is too short)
+        REJECTED INT        NOT NULL         -- Whether the null hypothesis was rejected
+    );""")
+    conn.execute("""CREATE TABLE Journal (
+        THREAD INT          NOT NULL,        -- Index of the data set (thread)
+        CELL TEXT           NOT NULL,        -- Algorithm key of the sweep cell
+        M INT               NOT NULL,        -- Parameter m (integer)
+        N INT               NOT NULL,        -- Parameter n (integer)
+        A TEXT,                              -- Multiplier a, decimal (NULL if unused)
+        W FLOAT,                             -- Reseed period w (NULL if unused)
+        DONE DATETIME DEFAULT CURRENT_TIMESTAMP -- When the cell was committed
+    );""")
+    conn.execute("""CREATE TABLE Sweep (
+        PARAMS TEXT         NOT NULL         -- JSON settings a resumed sweep must share
+    );""")
     print("Table created successfully")
+
+
+# Settings of the sweep stored in the database, or None for a database
+# written before the Journal existed
+def load_sweep(conn: sq.Connection) -> dict:
+    try:
+        row = conn.execute("SELECT PARAMS FROM Sweep").fetchone()
+    except sq.OperationalError:
+        return None
+    return None if row is None else json.loads(row[0])
+
+
+def save_sweep(conn: sq.Connection, params: dict) -> None:
+    with conn:
+        conn.execute("DELETE FROM Sweep")
+        conn.execute("INSERT INTO Sweep (PARAMS) VALUES (?)", (json.dumps(params),))
+
+
+# (THREAD, CELL, M, N, A, W) of every cell committed so far, A back as an
+# int like in the sweep's cells
+def completed_cells(conn: sq.Connection) -> set[tuple]:
+    return {
+        (thread, cell, m, n, None if a is None else int(a), w)
+        for thread, cell, m, n, a, w in conn.execute("SELECT THREAD, CELL, M, N, A, W FROM Journal")
+    }
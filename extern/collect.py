@@ -1,38 +1,72 @@
-import subprocess
+import asyncio
+import os
+import signal
 
+import numpy as np
 
-def run_program(cmd) -> list[float]:
+import extern.workers as wrk
+import profiling as prof
+
+
+# Run a one-shot shell command printing whitespace-separated numbers
+async def run_program(cmd: str, timeout: float) -> np.ndarray:
+    # A session of its own, so a timeout kills the whole command line
+    proc = await asyncio.create_subprocess_shell(
+        cmd,
+        stdout=asyncio.subprocess.PIPE,
+        stderr=asyncio.subprocess.PIPE,
+        start_new_session=True,
+    )
     try:
-        # Run the command and capture stdout (text mode)
-        result = subprocess.run(
-            cmd, shell=True, capture_output=True, text=True, check=True
-        )
-        # Split the output on whitespace and convert each part to float
-        numbers = [float(num) for num in result.stdout.strip().split()]
-        return numbers
-    except Exception as e:
-        print(f"Error running command {cmd}: {e}")
-        return []
+        stdout, stderr = await asyncio.wait_for(proc.communicate(), timeout)
+    except asyncio.TimeoutError:
+        os.killpg(proc.pid, signal.SIGKILL)
+        await proc.wait()
+        raise wrk.WorkerError("timeout", f"{cmd} took longer than {timeout} s")
+    if proc.returncode:
+        raise wrk.WorkerError("exit", stderr.decode().strip() or f"exit code {proc.returncode}")
+    return np.array(stdout.split(), dtype=np.float64)
+
+
+async def run_programs(
+    n: int, commands: dict[str, str], timeouts: dict[str, float]
+) -> wrk.Collection:
+    # All commands at once; latency is that of the slowest one
+    results = await asyncio.gather(
+        *(
+            run_program(f"{cmd} {n}", timeouts.get(key, wrk.BUILD_TIMEOUT))
+            for key, cmd in commands.items()
+        ),
+        return_exceptions=True,
+    )
+    samples, failures = {}, {}
+    for key, result in zip(commands, results):
+        if isinstance(result, wrk.WorkerError):
+            failures[key] = wrk.Failure(key, result.stage, str(result))
+        elif isinstance(result, BaseException):
+            raise result
+        else:
+            samples[key] = result
+    return wrk.Collection(samples, failures)
 
 
+# n numbers from each external program, collected concurrently. By default
+# they come from the persistent workers of extern/workers.py (built once,
+# kept running); pass shell `commands` to run one-shot programs instead.
 def main(
     n: int = 1000,
-    commands: dict[str, str] = {
-        "C": "gcc ./gcc/rand.c -o ./gcc/rand.out && ./gcc/rand.out",
-        "C++": "g++ ./gcc/rand.cpp -o ./gcc/rand.out && ./gcc/rand.out",
-        "Rust": "cd ./rust && cargo run --release --",
-        "JS": "node rand.js",
-        "Java": "javac ./java/Rand.java && java -cp ./java Rand",
-        "PHP": "php rand.php",
-    },
-) -> dict[str, list[float]]:
-    results = {}
-    for key, cmd in commands.items():
-        results[key] = run_program(f"{cmd} {n}")
-    return results
+    commands: dict[str, str] = None,
+    timeouts: dict[str, float] = None,
+) -> wrk.Collection:
+    with prof.stage("extern.collect", n=n):
+        if commands is None:
+            return wrk.collect(n, timeouts=timeouts)
+        return asyncio.run(run_programs(n, commands, timeouts or {}))
 
 
 if __name__ == "__main__":
     data = main()
-    for key, value in data.items():
+    for key, value in data.samples.items():
         print(f"{key}: {len(value)}")
+    for failure in data.failures.values():
+        print(failure)
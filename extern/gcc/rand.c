@@ -1,15 +1,46 @@
 
+#include <stdint.h>
 #include <stdio.h>
 #include <stdlib.h>
+#include <string.h>
 #include <time.h>
+#include <unistd.h>
+
+/* serve: read a little-endian uint32 n from stdin, reply with n as uint32
+ * and n little-endian doubles; n = 0 or end of input stops */
+static int serve(void) {
+    uint32_t n;
+    double *buf = NULL;
+    uint32_t cap = 0;
+    while (fread(&n, sizeof n, 1, stdin) == 1 && n > 0) {
+        if (n > cap) {
+            free(buf);
+            buf = malloc((size_t)n * sizeof *buf);
+            if (buf == NULL) return 1;
+            cap = n;
+        }
+        for (uint32_t i = 0; i < n; i++) {
+            buf[i] = (float)rand() / (float)RAND_MAX;
+        }
+        fwrite(&n, sizeof n, 1, stdout);
+        fwrite(buf, sizeof *buf, n, stdout);
+        fflush(stdout);
+    }
+    free(buf);
+    return 0;
+}
 
 int main(int argc, char *argv[]) {
     if (argc != 2) {
-        printf("Usage: %s n\n", argv[0]);
+        printf("Usage: %s n|serve\n", argv[0]);
         return 1;
     }
+    /* The pid keeps programs started in the same second apart */
+    srand(time(NULL) ^ getpid());
+    if (strcmp(argv[1], "serve") == 0) {
+        return serve();
+    }
     int n = atoi(argv[1]);
-    srand(time(NULL));
     for (int i = 0; i < n; i++) {
         float num = (float)rand() / (float)RAND_MAX;
         printf("%f ", num);
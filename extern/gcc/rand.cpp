@@ -1,15 +1,40 @@
 
-#include <iostream>
+#include <cstdint>
 #include <cstdlib>
+#include <cstring>
 #include <ctime>
+#include <iostream>
+#include <unistd.h>
+#include <vector>
+
+// serve: read a little-endian uint32 n from stdin, reply with n as uint32
+// and n little-endian doubles; n = 0 or end of input stops
+static int serve() {
+    std::uint32_t n;
+    std::vector<double> buf;
+    while (std::cin.read(reinterpret_cast<char*>(&n), sizeof n) && n > 0) {
+        buf.resize(n);
+        for (std::uint32_t i = 0; i < n; i++) {
+            buf[i] = static_cast<float>(std::rand()) / RAND_MAX;
+        }
+        std::cout.write(reinterpret_cast<const char*>(&n), sizeof n);
+        std::cout.write(reinterpret_cast<const char*>(buf.data()), n * sizeof(double));
+        std::cout.flush();
+    }
+    return 0;
+}
 
 int main(int argc, char* argv[]) {
     if (argc != 2) {
-        std::cout << "Usage: " << argv[0] << " n" << std::endl;
+        std::cout << "Usage: " << argv[0] << " n|serve" << std::endl;
         return 1;
     }
+    // The pid keeps programs started in the same second apart
+    std::srand(std::time(0) ^ getpid());
+    if (std::strcmp(argv[1], "serve") == 0) {
+        return serve();
+    }
     int n = std::atoi(argv[1]);
-    std::srand(std::time(0));
     for (int i = 0; i < n; i++) {
         float num = static_cast<float>(std::rand()) / RAND_MAX;
         std::cout << num << " ";
@@ -1,13 +1,49 @@
+import java.io.DataInputStream;
+import java.io.EOFException;
+import java.io.IOException;
+import java.io.OutputStream;
+import java.nio.ByteBuffer;
+import java.nio.ByteOrder;
 import java.util.Random;
 
 public class Rand {
-    public static void main(String[] args) {
+    // serve: read a little-endian uint32 n from stdin, reply with n as uint32
+    // and n little-endian doubles; n = 0 or end of input stops
+    static void serve(Random random) throws IOException {
+        DataInputStream in = new DataInputStream(System.in);
+        OutputStream out = System.out;
+        byte[] header = new byte[4];
+        while (true) {
+            try {
+                in.readFully(header);
+            } catch (EOFException e) {
+                return;
+            }
+            int n = ByteBuffer.wrap(header).order(ByteOrder.LITTLE_ENDIAN).getInt();
+            if (n == 0) {
+                return;
+            }
+            ByteBuffer buf = ByteBuffer.allocate(4 + 8 * n).order(ByteOrder.LITTLE_ENDIAN);
+            buf.putInt(n);
+            for (int i = 0; i < n; i++) {
+                buf.putDouble(random.nextFloat());
+            }
+            out.write(buf.array());
+            out.flush();
+        }
+    }
+
+    public static void main(String[] args) throws IOException {
         if (args.length != 1) {
-            System.out.println("Usage: java RandomFloats n");
+            System.out.println("Usage: java RandomFloats n|serve");
             System.exit(1);
         }
-        int n = Integer.parseInt(args[0]);
         Random random = new Random();
+        if (args[0].equals("serve")) {
+            serve(random);
+            return;
+        }
+        int n = Integer.parseInt(args[0]);
         for (int i = 0; i < n; i++) {
             System.out.print(random.nextFloat() + " ");
         }
@@ -1,12 +1,38 @@
 
-const n = parseInt(process.argv[2]);
-if (isNaN(n)) {
-  console.error('Usage: node script.js n');
-  process.exit(1);
+// serve: read a little-endian uint32 n from stdin, reply with n as uint32
+// and n little-endian doubles; n = 0 or end of input stops
+function serve() {
+  let pending = Buffer.alloc(0);
+  process.stdin.on('data', (chunk) => {
+    pending = Buffer.concat([pending, chunk]);
+    while (pending.length >= 4) {
+      const n = pending.readUInt32LE(0);
+      pending = pending.subarray(4);
+      if (n === 0) {
+        process.exit(0);
+      }
+      const out = Buffer.alloc(4 + 8 * n);
+      out.writeUInt32LE(n, 0);
+      for (let i = 0; i < n; i++) {
+        out.writeDoubleLE(Math.random(), 4 + 8 * i);
+      }
+      process.stdout.write(out);
+    }
+  });
 }
 
-let numbers = [];
-for (let i = 0; i < n; i++) {
-  numbers.push(Math.random());
+if (process.argv[2] === 'serve') {
+  serve();
+} else {
+  const n = parseInt(process.argv[2]);
+  if (isNaN(n)) {
+    console.error('Usage: node script.js n|serve');
+    process.exit(1);
+  }
+
+  let numbers = [];
+  for (let i = 0; i < n; i++) {
+    numbers.push(Math.random());
+  }
+  console.log(numbers.join(' '));
 }
-console.log(numbers.join(' '));
@@ -1,8 +1,38 @@
 <?php
 if ($argc != 2) {
-	echo "Usage: php script.php n\n";
+	echo "Usage: php script.php n|serve\n";
 	exit(1);
 }
+// Read exactly $length bytes from stdin, or null at end of input
+function read_exact($length) {
+	$buf = "";
+	while (strlen($buf) < $length) {
+		$chunk = fread(STDIN, $length - strlen($buf));
+		if ($chunk === false || $chunk === "") {
+			return null;
+		}
+		$buf .= $chunk;
+	}
+	return $buf;
+}
+
+if ($argv[1] === "serve") {
+	// Read a little-endian uint32 n from stdin, reply with n as uint32 and
+	// n little-endian doubles; n = 0 or end of input stops
+	while (($header = read_exact(4)) !== null) {
+		$n = unpack("V", $header)[1];
+		if ($n === 0) {
+			break;
+		}
+		$values = [];
+		for ($i = 0; $i < $n; $i++) {
+			$values[] = mt_rand() / mt_getrandmax();
+		}
+		fwrite(STDOUT, pack("V", $n) . pack("e*", ...$values));
+		fflush(STDOUT);
+	}
+	exit(0);
+}
 $n = (int)$argv[1];
 for ($i = 0; $i < $n; $i++) {
 	// mt_rand returns an integer, so we divide by mt_getrandmax() to get a float in [0,1]
@@ -1,12 +1,42 @@
 use rand::Rng;
 use std::env;
+use std::io::{self, Read, Write};
+
+// serve: read a little-endian u32 n from stdin, reply with n as u32 and n
+// little-endian f64 values; n = 0 or end of input stops
+fn serve() -> io::Result<()> {
+    let mut rng = rand::thread_rng();
+    let mut stdin = io::stdin().lock();
+    let mut stdout = io::stdout().lock();
+    let mut header = [0u8; 4];
+    let mut buf = Vec::new();
+    while stdin.read_exact(&mut header).is_ok() {
+        let n = u32::from_le_bytes(header);
+        if n == 0 {
+            break;
+        }
+        buf.clear();
+        buf.extend_from_slice(&header);
+        for _ in 0..n {
+            let num: f32 = rng.gen();
+            buf.extend_from_slice(&(num as f64).to_le_bytes());
+        }
+        stdout.write_all(&buf)?;
+        stdout.flush()?;
+    }
+    Ok(())
+}
 
 fn main() {
     let args: Vec<String> = env::args().collect();
     if args.len() != 2 {
-        eprintln!("Usage: {} n", args[0]);
+        eprintln!("Usage: {} n|serve", args[0]);
         std::process::exit(1);
     }
+    if args[1] == "serve" {
+        serve().expect("Broken pipe");
+        return;
+    }
     let n: usize = args[1].parse().expect("Invalid number");
     let mut rng = rand::thread_rng();
     for _ in 0..n {
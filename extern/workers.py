@@ -0,0 +1,298 @@
+# Long-lived external generator processes, driven concurrently by asyncio
+# Build once (cached by source hash) -> "serve" process -> float64 arrays
+#
+# Protocol over stdin/stdout, all little-endian:
+#   request   uint32 n          (n = 0 asks the program to exit)
+#   response  uint32 n, then n float64 values in [0, 1]
+
+import asyncio
+import atexit
+import hashlib
+import os
+import shutil
+import signal
+import struct
+import threading
+from pathlib import Path
+from typing import NamedTuple
+
+import numpy as np
+
+import profiling as prof
+
+ROOT = Path(__file__).resolve().parent
+BUILD_DIR = ROOT / "build"
+
+# Largest request sent at once; bigger samples are split
+MAX_REQUEST = 1 << 24
+# Bytes copied from a program's stdout into the sample array per read
+READ_CHUNK = 1 << 20
+
+# Default seconds allowed per program for building and for one sample
+BUILD_TIMEOUT = 600.0
+SAMPLE_TIMEOUT = 60.0
+
+# name -> (source files, build commands, run command). "{root}" is this
+# directory and "{out}" the cache directory of the build.
+PROGRAMS = {
+    "C": (
+        ["gcc/rand.c"],
+        [["gcc", "-O2", "{root}/gcc/rand.c", "-o", "{out}/rand"]],
+        ["{out}/rand"],
+    ),
+    "C++": (
+        ["gcc/rand.cpp"],
+        [["g++", "-O2", "{root}/gcc/rand.cpp", "-o", "{out}/rand"]],
+        ["{out}/rand"],
+    ),
+    "Rust": (
+        ["rust/src/main.rs", "rust/Cargo.toml"],
+        [
+            [
+                "cargo", "build", "--release", "--quiet",
+                "--manifest-path", "{root}/rust/Cargo.toml",
+                "--target-dir", "{out}/target",
+            ]
+        ],
+        ["{out}/target/release/rust"],
+    ),
+    "JS": (["rand.js"], [], ["node", "{root}/rand.js"]),
+    "Java": (
+        ["java/Rand.java"],
+        [["javac", "-d", "{out}", "{root}/java/Rand.java"]],
+        ["java", "-cp", "{out}", "Rand"],
+    ),
+    "PHP": (["rand.php"], [], ["php", "{root}/rand.php"]),
+}
+
+
+class WorkerError(RuntimeError):
+    def __init__(self, stage: str, message: str):
+        super().__init__(message)
+        self.stage = stage
+
+
+class Failure(NamedTuple):
+    # Why a program gave no sample. stage is one of "build", "start",
+    # "timeout" or "exit".
+    name: str
+    stage: str
+    message: str
+
+    def __str__(self) -> str:
+        return f"{self.name} failed at {self.stage}: {self.message}"
+
+
+class Collection(NamedTuple):
+    samples: dict[str, np.ndarray]
+    failures: dict[str, Failure]
+
+
+def _format(cmd: list[str], out: Path) -> list[str]:
+    return [part.format(root=ROOT, out=out) for part in cmd]
+
+
+def source_hash(name: str) -> str:
+    # Hash of the sources and the commands, so editing either rebuilds
+    sources, commands, run = PROGRAMS[name]
+    digest = hashlib.sha256(repr((commands, run)).encode())
+    for source in sources:
+        digest.update((ROOT / source).read_bytes())
+    return digest.hexdigest()[:16]
+
+
+async def _run(cmd: list[str], timeout: float) -> None:
+    try:
+        # A session of its own, so a timeout also stops the compilers it runs
+        proc = await asyncio.create_subprocess_exec(
+            *cmd,
+            stdout=asyncio.subprocess.DEVNULL,
+            stderr=asyncio.subprocess.PIPE,
+            start_new_session=True,
+        )
+    except OSError as e:
+        raise WorkerError("build", str(e))
+    try:
+        _, stderr = await asyncio.wait_for(proc.communicate(), timeout)
+    except asyncio.TimeoutError:
+        os.killpg(proc.pid, signal.SIGKILL)
+        await proc.wait()
+        raise WorkerError("build", f"{cmd[0]} took longer than {timeout} s")
+    if proc.returncode:
+        raise WorkerError("build", stderr.decode().strip())
+
+
+async def build(name: str, timeout: float = BUILD_TIMEOUT) -> list[str]:
+    """
+    Build an external program unless a build of the same sources exists.
+
+    Builds go to a temporary directory that is renamed into place when
+    complete, so concurrent sweep processes never run a half-built program.
+
+    :return: Command that runs the program.
+    """
+    sources, commands, run = PROGRAMS[name]
+    slug = name.lower().replace("+", "p")
+    out = BUILD_DIR / f"{slug}-{source_hash(name)}"
+    if commands and not out.exists():
+        tmp = BUILD_DIR / f"{out.name}.tmp{os.getpid()}"
+        shutil.rmtree(tmp, ignore_errors=True)
+        tmp.mkdir(parents=True)
+        try:
+            for cmd in commands:
+                await _run(_format(cmd, tmp), timeout)
+            tmp.rename(out)
+        except OSError:
+            pass  # Another process finished the same build first
+        finally:
+            shutil.rmtree(tmp, ignore_errors=True)
+    return _format(run, out)
+
+
+class Worker:
+    """
+    One external program running in "serve" mode, answering sample requests
+    until it is closed. Create with `await Worker.start(name)`.
+    """
+
+    def __init__(self, name: str, proc: asyncio.subprocess.Process):
+        self.name = name
+        self.proc = proc
+
+    @classmethod
+    async def start(cls, name: str, timeout: float = BUILD_TIMEOUT) -> "Worker":
+        cmd = await build(name, timeout)
+        try:
+            proc = await asyncio.create_subprocess_exec(
+                *cmd, "serve", stdin=asyncio.subprocess.PIPE, stdout=asyncio.subprocess.PIPE
+            )
+        except OSError as e:
+            raise WorkerError("start", str(e))
+        return cls(name, proc)
+
+    async def _read_into(self, out: np.ndarray) -> None:
+        # Fill a float64 array from stdout as the bytes arrive
+        view = memoryview(out).cast("B")
+        for offset in range(0, len(view), READ_CHUNK):
+            size = min(READ_CHUNK, len(view) - offset)
+            view[offset : offset + size] = await self.proc.stdout.readexactly(size)
+
+    async def _request(self, out: np.ndarray) -> None:
+        self.proc.stdin.write(struct.pack("<I", len(out)))
+        await self.proc.stdin.drain()
+        (count,) = struct.unpack("<I", await self.proc.stdout.readexactly(4))
+        if count != len(out):
+            raise WorkerError("exit", f"asked for {len(out)} numbers, got {count}")
+        await self._read_into(out)
+
+    async def sample(self, n: int) -> np.ndarray:
+        out = np.empty(n, dtype="<f8")
+        try:
+            for i in range(0, n, MAX_REQUEST):
+                await self._request(out[i : i + MAX_REQUEST])
+        except (asyncio.IncompleteReadError, ConnectionError) as e:
+            code = await self.proc.wait()
+            raise WorkerError("exit", f"exited with code {code} ({e})")
+        return out
+
+    def alive(self) -> bool:
+        return self.proc.returncode is None
+
+    async def close(self) -> None:
+        if not self.alive():
+            return
+        try:
+            self.proc.stdin.write(struct.pack("<I", 0))
+            self.proc.stdin.close()
+            await asyncio.wait_for(self.proc.wait(), 5)
+        except (OSError, asyncio.TimeoutError):
+            self.proc.kill()
+            await self.proc.wait()
+
+
+# The workers live on one event loop in a daemon thread, so they survive
+# between the synchronous collect() calls of a process.
+_loop: asyncio.AbstractEventLoop = None
+_workers: dict[str, Worker] = {}
+# Programs that could not be built or started are not retried
+_failed: dict[str, Failure] = {}
+
+
+def _submit(coro):
+    global _loop
+    if _loop is None:
+        _loop = asyncio.new_event_loop()
+        threading.Thread(target=_loop.run_forever, daemon=True).start()
+    return asyncio.run_coroutine_threadsafe(coro, _loop).result()
+
+
+async def _sample(name: str, n: int, timeout: float) -> np.ndarray:
+    worker = _workers.get(name)
+    if worker is None or not worker.alive():
+        try:
+            worker = _workers[name] = await Worker.start(name)
+        except WorkerError as e:
+            _failed[name] = Failure(name, e.stage, str(e))
+            raise
+    try:
+        # Samples overlap in time; the event's CPU time is not meaningful
+        with prof.stage("extern.sample", algo=name, n=n):
+            return await asyncio.wait_for(worker.sample(n), timeout)
+    except asyncio.TimeoutError:
+        # The pipe may hold part of a reply; start afresh next time
+        worker.proc.kill()
+        await worker.proc.wait()
+        raise WorkerError("timeout", f"no sample of {n} within {timeout} s")
+    except WorkerError:
+        _workers.pop(name, None)
+        raise
+
+
+async def _collect(n: int, names: list[str], timeouts: dict[str, float]) -> Collection:
+    names = [name for name in names if name not in _failed]
+    results = await asyncio.gather(
+        *(_sample(name, n, timeouts.get(name, SAMPLE_TIMEOUT)) for name in names),
+        return_exceptions=True,
+    )
+    samples, failures = {}, {}
+    for name, result in zip(names, results):
+        if isinstance(result, WorkerError):
+            failures[name] = Failure(name, result.stage, str(result))
+        elif isinstance(result, BaseException):
+            raise result
+        else:
+            samples[name] = result
+    return Collection(samples, failures)
+
+
+def collect(
+    n: int, names: list[str] = None, timeouts: dict[str, float] = None
+) -> Collection:
+    """
+    Sample n numbers from every program at once.
+
+    :param names: Programs to sample (default: all of PROGRAMS).
+    :param timeouts: Seconds allowed per program for one sample, by name.
+    :return: Samples of the programs that answered, and a Failure for each
+        one that did not. Programs that failed to build or start keep
+        their Failure and are not retried.
+    """
+    names = list(names or PROGRAMS)
+    collection = _submit(_collect(n, names, timeouts or {}))
+    for name in names:
+        if name in _failed:
+            collection.failures.setdefault(name, _failed[name])
+    return collection
+
+
+async def _close_all() -> None:
+    await asyncio.gather(*(worker.close() for worker in _workers.values()))
+    _workers.clear()
+
+
+def close_all() -> None:
+    if _loop is not None:
+        _submit(_close_all())
+
+
+atexit.register(close_all)
@@ -0,0 +1,171 @@
+# Per-stage timing of the sweep, off unless enabled
+# stage() blocks -> Events per process -> Chrome trace + summary per algorithm and m
+#
+# Enable with `python test.py --profile` or PRNG_PROFILE=1 in the environment
+# (PRNG_PROFILE=alloc also traces allocated bytes with tracemalloc, which
+# slows Python down several times). When off, stage() and tags() return a
+# shared no-op context manager.
+
+import contextlib
+import json
+import os
+import sys
+import threading
+import time
+import tracemalloc
+from pathlib import Path
+
+ENABLED = False
+TRACE_ALLOC = False
+
+# Events recorded in this process since the last flush()
+_events: list[dict] = []
+# Arguments added to every event, e.g. the algorithm and m of the cell
+_tags: dict = {}
+_NULL = contextlib.nullcontext()
+
+# Forked workers would otherwise flush the parent's events a second time
+os.register_at_fork(after_in_child=_events.clear)
+
+
+def enable(alloc: bool = False) -> None:
+    # Also exported, so worker processes started later record too
+    global ENABLED, TRACE_ALLOC
+    ENABLED, TRACE_ALLOC = True, alloc
+    if alloc and not tracemalloc.is_tracing():
+        tracemalloc.start()
+    os.environ["PRNG_PROFILE"] = "alloc" if alloc else "1"
+
+
+if os.environ.get("PRNG_PROFILE", "0") not in ("", "0"):
+    enable(os.environ["PRNG_PROFILE"] == "alloc")
+
+
+class _Stage:
+    # Wall time, CPU time of this thread and the net change in allocated
+    # blocks (and bytes, with TRACE_ALLOC) of one block of code, recorded as
+    # a Chrome trace "complete" event.
+    __slots__ = ("name", "args", "wall", "cpu", "blocks", "bytes")
+
+    def __init__(self, name: str, args: dict):
+        self.name, self.args = name, args
+
+    def __enter__(self) -> "_Stage":
+        if TRACE_ALLOC:
+            self.bytes = tracemalloc.get_traced_memory()[0]
+        self.blocks = sys.getallocatedblocks()
+        self.cpu = time.thread_time_ns()
+        self.wall = time.perf_counter_ns()
+        return self
+
+    def __exit__(self, *exc) -> None:
+        wall = time.perf_counter_ns() - self.wall
+        cpu = time.thread_time_ns() - self.cpu
+        args = {**_tags, **self.args, "alloc_blocks": sys.getallocatedblocks() - self.blocks}
+        if TRACE_ALLOC:
+            args["alloc_bytes"] = tracemalloc.get_traced_memory()[0] - self.bytes
+        # perf_counter is CLOCK_MONOTONIC, shared by all processes, so the
+        # events of the workers line up on one timeline
+        _events.append(
+            {
+                "name": self.name,
+                "ph": "X",
+                "ts": self.wall / 1000,
+                "dur": wall / 1000,
+                "tdur": cpu / 1000,
+                "pid": os.getpid(),
+                "tid": threading.get_native_id(),
+                "args": args,
+            }
+        )
+
+
+def stage(name: str, **args):
+    # `with stage("ks"):` records the block as one event named "ks"
+    return _Stage(name, args) if ENABLED else _NULL
+
+
+@contextlib.contextmanager
+def tags(**args):
+    # Add args to every event recorded inside the block
+    if not ENABLED:
+        yield
+        return
+    saved = dict(_tags)
+    _tags.update(args)
+    try:
+        yield
+    finally:
+        _tags.clear()
+        _tags.update(saved)
+
+
+def flush(directory: str) -> None:
+    # Append this process's events to a spool file of its own in directory
+    if not _events:
+        return
+    Path(directory).mkdir(parents=True, exist_ok=True)
+    with open(f"{directory}/{os.getpid()}.jsonl", "a") as f:
+        for event in _events:
+            f.write(json.dumps(event) + "\n")
+    _events.clear()
+
+
+def clear(directory: str) -> None:
+    for path in Path(directory).glob("*.jsonl"):
+        path.unlink()
+
+
+def load(directory: str) -> list[dict]:
+    events = []
+    for path in sorted(Path(directory).glob("*.jsonl")):
+        with open(path) as f:
+            events.extend(json.loads(line) for line in f)
+    return events
+
+
+# Timeline for chrome://tracing or https://ui.perfetto.dev
+def write_trace(events: list[dict], path: str) -> None:
+    with open(path, "w") as f:
+        json.dump({"traceEvents": events, "displayTimeUnit": "ms"}, f)
+
+
+def summary(events: list[dict]):
+    """
+    Totals per (algorithm, m, stage): calls, wall and CPU milliseconds and
+    net allocated blocks (and bytes when traced). Stages outside a cell
+    have an empty algorithm.
+    """
+    import pandas as pd
+
+    rows = [
+        {
+            "ALGO": event["args"].get("algo", ""),
+            "M": event["args"].get("m", 0),
+            "STAGE": event["name"],
+            "CALLS": 1,
+            "WALL_MS": event["dur"] / 1000,
+            "CPU_MS": event["tdur"] / 1000,
+            "ALLOC_BLOCKS": event["args"].get("alloc_blocks", 0),
+            "ALLOC_BYTES": event["args"].get("alloc_bytes", 0),
+        }
+        for event in events
+    ]
+    if not rows:
+        return pd.DataFrame()
+    return pd.DataFrame(rows).groupby(["ALGO", "M", "STAGE"]).sum()
+
+
+def report(spool: str, out_dir: str) -> None:
+    # Merge the spool files into trace.json and summary.csv in out_dir
+    events = load(spool)
+    if not events:
+        return
+    Path(out_dir).mkdir(parents=True, exist_ok=True)
+    write_trace(events, f"{out_dir}/trace.json")
+    table = summary(events)
+    table.to_csv(f"{out_dir}/summary.csv")
+    print("\nTime per stage (ms):")
+    totals = table.groupby("STAGE")[["CALLS", "WALL_MS", "CPU_MS", "ALLOC_BLOCKS"]].sum()
+    print(totals.sort_values("WALL_MS", ascending=False).round(2))
+    print(f"Trace and per-algorithm summary written to {out_dir}")
@@ -0,0 +1,101 @@
+# Read-side queries over the RandomnessTests and BatteryTests tables
+# One pooled connection per database, aggregations done in SQL
+
+import sqlite3 as sq
+
+import numpy as np
+import pandas as pd
+
+import dbconn as db
+
+# Open connections keyed by database path
+_pool: dict[str, sq.Connection] = {}
+
+
+def connection(path: str) -> sq.Connection:
+    # Reuse one connection per database and make sure lookups by
+    # algorithm and m are served from an index.
+    conn = _pool.get(path)
+    if conn is None:
+        conn = sq.connect(path)
+        conn.execute(
+            "CREATE INDEX IF NOT EXISTS idx_algo_m ON RandomnessTests (ALGO, M)"
+        )
+        _pool[path] = conn
+    return conn
+
+
+def close_all() -> None:
+    for conn in _pool.values():
+        conn.close()
+    _pool.clear()
+
+
+def _filter(algo: str = None, thread: int = None) -> tuple[str, tuple]:
+    clauses, params = [], ()
+    if algo is not None:
+        clauses.append("ALGO = ?")
+        params += (algo,)
+    if thread is not None:
+        clauses.append("THREAD = ?")
+        params += (thread,)
+    return (" WHERE " + " AND ".join(clauses) if clauses else ""), params
+
+
+def columns(
+    path: str, algo: str, select: list[str], thread: int = None
+) -> dict[str, np.ndarray]:
+    # Selected columns for one algorithm, ordered by m, as NumPy arrays.
+    # RAND_NUMS is only read when it is listed; use numbers() to decode it.
+    where, params = _filter(algo, thread)
+    sql = f"SELECT {', '.join(select)} FROM RandomnessTests{where} ORDER BY M ASC"
+    rows = connection(path).execute(sql, params).fetchall()
+    if not rows:
+        return {name: np.array([]) for name in select}
+    return {name: np.array(values) for name, values in zip(select, zip(*rows))}
+
+
+def numbers(path: str, algo: str, thread: int = None) -> tuple[np.ndarray, list]:
+    # m values and decoded random numbers of one algorithm, ordered by m.
+    where, params = _filter(algo, thread)
+    cursor = connection(path).execute(
+        f"SELECT * FROM RandomnessTests{where} ORDER BY M ASC", params
+    )
+    names = [col[0] for col in cursor.description]
+    m_values, data = [], []
+    for row in cursor:
+        row = dict(zip(names, row))
+        m_values.append(row["M"])
+        data.append(db.decode_numbers(row["RAND_NUMS"], row.get("RAND_FORMAT")))
+    return np.array(m_values), data
+
+
+def rejections(path: str, thread: int = None) -> pd.DataFrame:
+    # Per-algorithm rejection counts and timing, aggregated by SQLite.
+    where, params = _filter(thread=thread)
+    return pd.read_sql_query(
+        "SELECT ALGO, SUM(KS_REJECTED) AS KS, SUM(CHI_REJECTED) AS CHI, "
+        "SUM(TIME) AS TIME, AVG(TIME) AS MEAN_TIME, COUNT(*) AS TOTAL "
+        f"FROM RandomnessTests{where} GROUP BY ALGO",
+        connection(path),
+        params=params,
+        index_col="ALGO",
+    )
+
+
+def battery(path: str, thread: int = None) -> pd.DataFrame:
+    # Per-algorithm, per-test rejection counts of the extended battery.
+    # Databases written before the battery existed give an empty frame.
+    conn = connection(path)
+    found = conn.execute(
+        "SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = 'BatteryTests'"
+    ).fetchone()
+    if found is None:
+        return pd.DataFrame(columns=["ALGO", "TEST", "REJECTED", "TOTAL"])
+    where, params = _filter(thread=thread)
+    return pd.read_sql_query(
+        "SELECT ALGO, TEST, SUM(REJECTED) AS REJECTED, COUNT(*) AS TOTAL "
+        f"FROM BatteryTests{where} GROUP BY ALGO, TEST",
+        conn,
+        params=params,
+    )
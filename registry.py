@@ -0,0 +1,184 @@
+# Registry of the algorithms, external programs and statistical tests
+# name -> Entry ("module:attribute" and metadata) -> object, imported on first use
+#
+# Listing names never imports the generators or scipy: built-in algorithms
+# and programs are entries of the table at the bottom. Modules that register
+# with the @plugin decorator (battery.py for the tests, PLUGINS in env.config)
+# are imported when their kind is first listed, and installed packages can
+# add entries through the entry point groups in ENTRY_POINTS.
+
+import importlib
+from functools import lru_cache
+from importlib.metadata import entry_points
+from typing import NamedTuple
+
+import settings
+
+KINDS = ("algorithm", "extern", "test")
+
+# Entry point group of each kind, e.g. in a plugin's pyproject.toml:
+#   [project.entry-points."prng.algorithms"]
+#   mine = "mypackage.module:mine"
+ENTRY_POINTS = {
+    "algorithm": "prng.algorithms",
+    "extern": "prng.extern",
+    "test": "prng.tests",
+}
+
+# Modules registering entries of a kind with @plugin
+PROVIDERS = {"algorithm": list(settings.PLUGINS), "extern": [], "test": ["battery"]}
+
+
+class Entry(NamedTuple):
+    kind: str
+    name: str
+    target: str  # "module:attribute"; for "extern", the table indexed by name
+    group: str = "sweep"  # Algorithms of the default sweep, or e.g. "rejected"
+    width: int = None  # Native output bits; None for values modulo m + 1
+    seedable: bool = False  # Takes seed= and is reproducible with it
+    streams: bool = False  # Takes stream= for per-thread substreams
+    backend: str = None  # "module:attribute" of the NumPy block backend
+    exponent: bool = False  # Takes the exponent e of its multiplier a = 5 * 10^e
+    input: str = None  # Tests: "bits", "uniform" or "integers" (see battery.run)
+
+
+_entries: dict[tuple[str, str], Entry] = {}
+_discovered: set[str] = set()
+
+
+def register(kind: str, name: str, target: str, **meta) -> Entry:
+    if kind not in KINDS:
+        raise ValueError(f"Unknown kind {kind!r} (choose from {', '.join(KINDS)})")
+    entry = Entry(kind, name, target, **meta)
+    _entries[kind, name] = entry
+    return entry
+
+
+def plugin(kind: str, name: str = None, **meta):
+    """
+    Decorator registering a function under name (default: its own name).
+
+        @registry.plugin("algorithm", "mine", seedable=True)
+        def mine(m, n, a, seed=None): ...
+    """
+
+    def decorate(func):
+        register(kind, name or func.__name__, f"{func.__module__}:{func.__qualname__}", **meta)
+        return func
+
+    return decorate
+
+
+# Import the providers of kind and read its entry points, once
+def _discover(kind: str) -> None:
+    if kind in _discovered:
+        return
+    _discovered.add(kind)
+    for module in PROVIDERS[kind]:
+        importlib.import_module(module)
+    for point in entry_points(group=ENTRY_POINTS[kind]):
+        if (kind, point.name) not in _entries:
+            register(kind, point.name, point.value, group="plugin")
+
+
+def entries(kind: str, group: str = None) -> list[Entry]:
+    _discover(kind)
+    return [
+        entry
+        for (k, _), entry in _entries.items()
+        if k == kind and (group is None or entry.group == group)
+    ]
+
+
+def names(kind: str, group: str = None) -> list[str]:
+    return [entry.name for entry in entries(kind, group)]
+
+
+def get(kind: str, name: str) -> Entry:
+    _discover(kind)
+    if (kind, name) not in _entries:
+        raise KeyError(f"Unknown {kind} {name!r} (choose from {', '.join(names(kind))})")
+    return _entries[kind, name]
+
+
+@lru_cache(maxsize=None)
+def resolve(target: str):
+    module, _, attribute = target.partition(":")
+    obj = importlib.import_module(module)
+    for part in attribute.split("."):
+        obj = getattr(obj, part)
+    return obj
+
+
+def load(kind: str, name: str, vectorized: bool = False):
+    """
+    The registered object, importing its module on first use.
+
+    :param vectorized: Return the NumPy block backend instead, if the entry
+        has one.
+    """
+    entry = get(kind, name)
+    if vectorized and entry.backend:
+        return resolve(entry.backend)
+    obj = resolve(entry.target)
+    return obj[name] if kind == "extern" else obj
+
+
+# ---------------------------------------------------------------------------
+# Built-in entries
+# ---------------------------------------------------------------------------
+
+for name, target, backend in [
+    ("hybrid", "hybrid_prng", "hybrid_prng_lanes"),  # Hybrid PRNG
+    ("switch", "switch_prng", "switch_prng_lanes"),  # Switch-based PRNG
+    ("chprng", "tent_hybrid_3", "tent_hybrid_3_lanes"),  # Tent-based PRNG version 03
+]:
+    register(
+        "algorithm", name, f"algos.hprng:{target}",
+        seedable=True, backend=f"algos.generators:{backend}",
+    )
+
+for name, width in [
+    ("mt19937", 32),  # Mersenne Twister
+    ("pcg", 32),  # PCG
+    ("xorshift128plus", 64),  # Xorshift128+
+    ("well512a", 32),  # Well512a
+    ("splitmix64", 64),  # Splitmix64
+]:
+    register(
+        "algorithm", name, f"algos.hprng:{name}",
+        width=width, seedable=True, streams=True, backend=f"algos.generators:{name}",
+    )
+
+# Earlier designs kept for comparison, as rejected.<function>
+for name in [
+    "tent_hybrid", "tent_hybrid_2", "tent_hybrid_5", "gauss_hybrid", "gauss_hybrid_2",
+    "gauss_map_prng",
+]:
+    register("algorithm", f"rejected.{name}", f"algos.rejected:{name}", group="rejected")
+
+# The rejected designs computing a = 5 * 10^a themselves
+for name in [
+    "shift_prng", "switch_shift_rotate_alt_prng", "switch_shift_rotate_prng",
+    "xor_hprng", "mask_prng", "mask_alt_prng", "shift_rotate_prng", "mask_shift_prng",
+    "switch_mask_shift_prng", "mask_shift_alt_prng", "switch_mask_shift_alt_prng",
+]:
+    register(
+        "algorithm", f"rejected.{name}", f"algos.rejected:{name}",
+        group="rejected", exponent=True,
+    )
+
+# Reference programs built and sampled by extern/workers.py
+for name in ["C", "C++", "Rust", "JS", "Java", "PHP"]:
+    register("extern", name, "extern.workers:PROGRAMS")
+
+
+if __name__ == "__main__":
+    import registry  # The module providers register with, not __main__
+
+    for kind in KINDS:
+        print(f"{kind}:")
+        for entry in registry.entries(kind):
+            meta = [f"{field}={value}" for field, value in entry._asdict().items()
+                    if field not in ("kind", "name", "target") and value not in (None, False)]
+            print(f"  {entry.name:40} {entry.target:44} {' '.join(meta)}")
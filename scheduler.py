@@ -0,0 +1,31 @@
+# Runs independent sweep cells in a process pool
+# Tasks -> Worker processes -> (task, result) pairs back to one consumer
+
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from typing import Callable, Iterable, Iterator
+
+
+def order_tasks(tasks: Iterable, cost: Callable = None) -> list:
+    # Most expensive first (longest processing time rule): the pool hands
+    # tasks out in submission order, so the cheap cells fill in the gaps
+    # left by the long ones and all cores finish at about the same time.
+    tasks = list(tasks)
+    if cost is not None:
+        tasks.sort(key=cost, reverse=True)
+    return tasks
+
+
+def run(
+    worker: Callable, tasks: Iterable, workers: int = None, cost: Callable = None
+) -> Iterator[tuple]:
+    # Yield (task, worker(task)) as soon as each task completes. worker must
+    # be a module-level function so it can be pickled into the pool.
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        futures = {pool.submit(worker, task): task for task in order_tasks(tasks, cost)}
+        try:
+            for future in as_completed(futures):
+                yield futures[future], future.result()
+        except BaseException:
+            for future in futures:
+                future.cancel()
+            raise
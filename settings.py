@@ -0,0 +1,18 @@
+# Settings shared by the sweep and the tools that read its results
+# env.config -> Result paths and the algorithm selection, without the sweep's imports
+
+from dotenv import dotenv_values
+
+# Load environment variables for configuration
+config = dotenv_values("env.config")
+
+RESULTS_DIR = config["RESULTS_DIR"] or "./results"
+DB_DIR = config["DB_DIR"] or "/db"
+PLOT_DIR = config.get("PLOT_DIR") or "/plots"  # Plots of headless runs
+# Algorithms run with their NumPy block backend (see registry.Entry.backend)
+VECTORIZE = [key.strip() for key in (config.get("VECTORIZE") or "").split(",") if key.strip()]
+# Extra modules registering algorithms or tests with registry.plugin
+PLUGINS = [name.strip() for name in (config.get("PLUGINS") or "").split(",") if name.strip()]
+
+# All threads write into one consolidated database
+RESULTS_DB = f"{RESULTS_DIR + DB_DIR}/results.db"
@@ -0,0 +1,44 @@
+# Statistical test kernels on NumPy arrays of any length
+# Raw numbers -> Normalized [0, 1) array -> K-S and Chi-Square results
+
+import numpy as np
+from scipy.stats import chisquare, kstest
+
+
+# Normalize random numbers in [0, m] to [0, 1). Float arrays are divided
+# in place; anything else is converted to a new float64 array first.
+def normalize(numbers, m: int) -> np.ndarray:
+    x = numbers
+    if not (isinstance(x, np.ndarray) and x.dtype == np.float64 and x.flags.writeable):
+        x = np.array(numbers, dtype=np.float64)
+    x /= m + 1
+    return x
+
+
+# Bin of each value among k equal-width bins over [0, 1]
+def bin_index(x: np.ndarray, k: int) -> np.ndarray:
+    return np.minimum((x * k).astype(np.intp), k - 1)
+
+
+def histogram(x: np.ndarray, k: int) -> np.ndarray:
+    return np.bincount(bin_index(x, k), minlength=k)
+
+
+# Kolmogorov-Smirnov test against U(0, 1)
+def ks(x: np.ndarray, alpha: float) -> tuple:
+    if len(x) == 0:
+        return np.nan, np.nan, 0
+    D, p_value = kstest(x, "uniform")
+    # Return test statistic, p-value, and rejection status
+    return D, p_value, int(p_value < alpha)
+
+
+# Chi-Square test over k bins, with expected counts taken from the sample size
+def chi(x: np.ndarray, alpha: float, k: int = 10) -> tuple:
+    if len(x) == 0:
+        return np.nan, np.nan, 0
+    observed = histogram(x, k)
+    expected = np.full(k, len(x) / k)
+    chi2_stat, p_value = chisquare(observed, expected)
+    # Return test statistic, p-value, and rejection status
+    return chi2_stat, p_value, int(p_value < alpha)
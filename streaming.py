@@ -0,0 +1,64 @@
+# Constant-memory K-S and Chi-Square tests over chunked samples
+# Chunks of numbers in [0, 1) -> Running histogram -> Test statistics
+
+from typing import Iterable
+
+import numpy as np
+from scipy.stats import chisquare, kstwo
+
+
+class Histogram:
+    """
+    Running histogram of values in [0, 1) over `bins` equal-width bins.
+
+    Memory is fixed by `bins`, not by the number of samples, and two
+    histograms with the same bins merge by adding their counts, so chunks
+    can be counted in different workers and combined afterwards.
+    """
+
+    def __init__(self, bins: int = 100_000):
+        self.counts = np.zeros(bins, dtype=np.int64)
+        self.n = 0
+
+    def update(self, chunk: np.ndarray) -> None:
+        bins = len(self.counts)
+        index = np.minimum((np.asarray(chunk) * bins).astype(np.int64), bins - 1)
+        self.counts += np.bincount(index, minlength=bins)
+        self.n += len(index)
+
+    def merge(self, other: "Histogram") -> None:
+        self.counts += other.counts
+        self.n += other.n
+
+    def ks(self) -> tuple:
+        """
+        K-S statistic against U(0, 1), from the empirical CDF at the bin
+        edges. The true D lies in [lower, upper]; the gap is at most one bin
+        width plus the largest bin's share of the sample. Returns
+        (upper, p-value of upper, lower) so the test errs towards rejection.
+        """
+        bins = len(self.counts)
+        edges = np.arange(bins + 1) / bins
+        cdf = np.concatenate(([0], np.cumsum(self.counts))) / max(self.n, 1)
+        lower = np.abs(cdf - edges).max()
+        upper = max((cdf[1:] - edges[:-1]).max(), (edges[1:] - cdf[:-1]).max())
+        return upper, kstwo.sf(upper, self.n), lower
+
+    def chi(self, k: int = 10) -> tuple:
+        # Chi-Square over k bins, merged from the fine bins by their left
+        # edges. When k does not divide the fine bins, the merged bins differ
+        # by one fine bin and each expects its share of them.
+        bins = len(self.counts)
+        if not 0 < k <= bins:
+            raise ValueError(f"k = {k} is not between 1 and the {bins} fine bins")
+        merged = np.arange(bins) * k // bins
+        observed = np.bincount(merged, weights=self.counts, minlength=k)
+        expected = np.bincount(merged, minlength=k) * (self.n / bins)
+        return chisquare(observed, expected)
+
+
+def run(chunks: Iterable[np.ndarray], bins: int = 100_000) -> Histogram:
+    hist = Histogram(bins)
+    for chunk in chunks:
+        hist.update(chunk)
+    return hist
@@ -1,26 +1,37 @@
+import inspect
+import itertools
 import os
+import signal
 import sqlite3 as sq
 import sys
-import threading
+import time
 import timeit
+from functools import lru_cache, partial
 from pathlib import Path
+from typing import NamedTuple
 
 import numpy as np
-from dotenv import dotenv_values
-from scipy.stats import chisquare, kstest
 
 # Append the directory containing algorithm implementations to the path
 sys.path.append("./algos")
 
-import algos.hprng as alg  # Hybrid PRNG algorithms
+import algos.generators as gens  # Stateful generators and NumPy block backends
+import algos.entropy as ent  # Seeds of the hybrid generators
 import dbconn as db  # Database-related operations
 import visualize as vis  # Visualization functions
-import binaryGen as gen  # Binary file generation
+import binaryGen as gen  # Packed binary file generation
 import compilation as cmp  # Compilattion
 import extern.collect as clct  # External Library tests
-
-# Load environment variables for configuration
-config = dotenv_values("env.config")
+import scheduler as sched  # Process pool sweep executor
+import benchmark as bench  # Adaptive timing
+import streaming  # Constant-memory tests for large N
+import stats as st  # NumPy statistics kernels
+import battery  # Extended randomness test battery
+import cache  # Content-addressed result cache
+import cli  # Command line and TOML sweep settings
+import profiling as prof  # Per-stage timing, off unless enabled
+import registry  # Algorithms, external programs and tests by name
+from settings import config, RESULTS_DIR, DB_DIR, PLOT_DIR, VECTORIZE, RESULTS_DB
 
 # Parameters loaded from environment variables
 M_MULTIPLIER = int(config["M_MULTIPLIER"] or 1)
@@ -28,91 +39,160 @@ M_INITIAL = int(config["M_INITIAL"] or 1)
 M_LIMIT = int(config["M_LIMIT"] or 1)
 ALPHA = float(config["ALPHA"] or 0.05)
 N = int(config["N"] or 1000)
-RESULTS_DIR = config["RESULTS_DIR"] or "./results"
+CHI_BINS = int(config.get("CHI_BINS") or 10)
 BIN_DIR = config["BIN_DIR"] or "/bin"
-DB_DIR = config["DB_DIR"] or "/db"
+BIN_MODE = config.get("BIN_MODE") or "bits"  # "bits" or full generator "words"
+NPY_DIR = config.get("NPY_DIR") or "/npy"
+PROFILE_DIR = config.get("PROFILE_DIR") or "/profile"  # Trace of profiled runs
+RAND_STORAGE = config.get("RAND_STORAGE") or "blob"  # "blob" or "npy" sidecar files
+RAND_COMPRESS = (config.get("RAND_COMPRESS") or "0") == "1"
+DB_COMMIT_EVERY = int(config.get("DB_COMMIT_EVERY") or 50)
+CACHE_DIR = config.get("CACHE_DIR") or "/cache"
+CACHE_MAX_MB = float(config.get("CACHE_MAX_MB") or 0)  # 0 disables the cache
+CACHE_SAMPLES = (config.get("CACHE_SAMPLES") or "1") == "1"
+STREAM_THRESHOLD = int(config.get("STREAM_THRESHOLD") or 10_000_000)
+STREAM_CHUNK = int(config.get("STREAM_CHUNK") or 1_000_000)
+STREAM_BINS = int(config.get("STREAM_BINS") or 100000)
+TIME_MIN_REPEAT = int(config.get("TIME_MIN_REPEAT") or 5)
+TIME_MAX_REPEAT = int(config.get("TIME_MAX_REPEAT") or 100)
+TIME_REL_CI = float(config.get("TIME_REL_CI") or 0.05)
+BATTERY = [name.strip() for name in (config.get("BATTERY") or "").split(",") if name.strip()]
+# Master seed of the hybrid generators (thread i uses thread_seed(i)); blank
+# seeds them from the clock
+HYBRID_SEED = int(config["HYBRID_SEED"]) if config.get("HYBRID_SEED") else None
+# Seconds allowed per external program for one sample, as "name:seconds" pairs
+EXTERN_TIMEOUTS = {
+    name.strip(): float(seconds)
+    for name, _, seconds in (
+        pair.partition(":") for pair in (config.get("EXTERN_TIMEOUTS") or "").split(",")
+    )
+    if name.strip()
+}
+
+# Results of earlier sweeps, kept across runs
+RESULTS_CACHE = f"{RESULTS_DIR + CACHE_DIR}/cache.db"
+# Events of every process of a profiled sweep, merged at its end
+PROFILE_SPOOL = f"{RESULTS_DIR + PROFILE_DIR}/spool"
 
 # Create test result directory:
 Path(RESULTS_DIR + DB_DIR).mkdir(parents=True, exist_ok=True)
 Path(RESULTS_DIR + BIN_DIR).mkdir(parents=True, exist_ok=True)
+if RAND_STORAGE == "npy":
+    Path(RESULTS_DIR + NPY_DIR).mkdir(parents=True, exist_ok=True)
+if CACHE_MAX_MB > 0:
+    Path(RESULTS_DIR + CACHE_DIR).mkdir(parents=True, exist_ok=True)
+
+# Task key for the external library collection
+EXTERNAL = "extern"
 
-# Dictionary of algorithms with their respective functions
-algo_list = {
-    "hybrid": alg.hybrid_prng,  # Hybrid PRNG
-    "switch": alg.switch_prng,  # Switch-based PRNG
-    "chprng": alg.tent_hybrid_3,  # Tent-based PRNG version 03
-    "mt19937": alg.mt19937,  # Mersenne Twister
-    "pcg": alg.pcg,  # PCG
-    "xorshift128plus": alg.xorshift128plus,  # Xorshift128+
-    "well512a": alg.well512a,  # Well512a
-    "splitmix64": alg.splitmix64,  # Splitmix64
-}
+
+# Function of a registered algorithm, with its NumPy block backend if
+# listed in VECTORIZE
+def algorithm(key: str):
+    return registry.load("algorithm", key, vectorized=key in VECTORIZE)
+
+
+# Algorithms of the default sweep; registry.names("algorithm") lists the
+# rejected designs and plugins too
+algo_list = {key: algorithm(key) for key in registry.names("algorithm", "sweep")}
 
 
 # Normalize random numbers to [0, 1] range
-def normalize(random_nums: list, m: int) -> list:
-    return [num / (m + 1) for num in random_nums]
+def normalize(random_nums, m: int) -> np.ndarray:
+    return st.normalize(random_nums, m)
 
 
 # Perform Kolmogorov-Smirnov (K-S) test on a dataset
-def ks(numbers: list[float]) -> tuple:
-    D, p_value = kstest(numbers, "uniform")
-    # Return test statistic, p-value, and rejection status
-    return D, p_value, int(p_value < ALPHA)
-
-
-# Perform Chi-Square test on a dataset
-def chi(numbers: list[float]) -> tuple:
-    k = 10  # Number of bins
-    bins = np.linspace(0, 1, k + 1)  # Define bin edges
-    observed, _ = np.histogram(numbers, bins)  # Observed frequencies
-    expected = [N / k] * k  # Expected frequencies
-
-    # Perform the Chi-Square test
-    chi2_stat, p_value = chisquare(observed, expected)
-    # Return test statistic, p-value, and rejection status
-    return chi2_stat, p_value, int(p_value < ALPHA)
-
-
-# Conduct tests (K-S and Chi-Square) for a specific algorithm
-def conduct_test(m: int, a: int, algorithm) -> dict:
-    a = 5 * (10**a)  # Scale 'a' by a factor
-    numbers = algorithm(m, N, a)  # Generate random numbers using the algorithm
-    numbers = normalize(numbers, m)  # Normalize the numbers
-    total_time = timeit.timeit(
-        lambda: algorithm(m, N, a), number=100
-    )  # Time the algorithm
-    time_per_execution = total_time / 100  # Calculate the average time per execution
+def ks(numbers: np.ndarray) -> tuple:
+    return st.ks(numbers, ALPHA)
+
+
+# Perform Chi-Square test on a dataset, expecting len(numbers) / k per bin
+def chi(numbers: np.ndarray) -> tuple:
+    return st.chi(numbers, ALPHA, CHI_BINS)
 
+
+# Run the tests listed in BATTERY; returns (test, statistic, p-value, rejected) rows
+def run_battery(numbers: np.ndarray, m: int) -> list[tuple]:
+    return battery.run(BATTERY, numbers, m, ALPHA)
+
+
+# Conduct tests (K-S, Chi-Square and the BATTERY selection) for a specific algorithm
+def conduct_test(m: int, n: int, a: int, algorithm) -> dict:
+    # Time the algorithm until the confidence interval is tight, and test
+    # the output of the last timed run instead of generating it again
+    with prof.stage("generate"):
+        numbers, timing = bench.measure(
+            lambda: algorithm(m, n, a),
+            min_repeat=TIME_MIN_REPEAT,
+            max_repeat=TIME_MAX_REPEAT,
+            rel_ci=TIME_REL_CI,
+        )
+    with prof.stage("normalize"):
+        numbers = normalize(numbers, m)  # Normalize the numbers
+
+    with prof.stage("ks"):
+        ks_result = ks(numbers)
+    with prof.stage("chi"):
+        chi_result = chi(numbers)
+    with prof.stage("battery"):
+        battery_result = run_battery(numbers, m)
     return {
-        "ks": ks(numbers),
-        "chi": chi(numbers),
+        "ks": ks_result,
+        "chi": chi_result,
+        "battery": battery_result,
         "numbers": numbers,
-        "time": time_per_execution,
+        "time": timing["mean"],  # Average time per execution
     }
 
 
-# Conduct tests for external libraries
-def conduct_external_test() -> dict[str, dict]:
-    extern_dir = Path("./extern")
-    data = clct.main(
-        N,
-        {
-            "C": f"gcc {extern_dir}/gcc/rand.c -o {extern_dir}/gcc/rand.out && {extern_dir}/gcc/rand.out",
-            "C++": f"g++ {extern_dir}/gcc/rand.cpp -o {extern_dir}/gcc/rand.out && {extern_dir}/gcc/rand.out",
-            "Rust": f"cd {extern_dir}/rust && cargo run --release --",
-            "JS": f"node {extern_dir}/rand.js",
-            "Java": f"javac {extern_dir}/java/Rand.java && java -cp {extern_dir}/java Rand",
-            "PHP": f"php {extern_dir}/rand.php",
-        },
-    )
+# Conduct the tests in chunks, without holding all n numbers in memory
+def conduct_stream_test(
+    m: int, n: int, a: int, algorithm, stream: int = 0, seed: int = None, **kwargs
+) -> dict:
+    source = gens.open_stream(algorithm.__name__, m, n, a, stream, seed, **kwargs)
+    hist = streaming.Histogram(STREAM_BINS)
+
+    # Only generation is timed, once over the whole stream
+    elapsed = 0.0
+    for offset in range(0, n, STREAM_CHUNK):
+        with prof.stage("generate"):
+            start = time.perf_counter()
+            chunk = source.next_block(min(STREAM_CHUNK, n - offset))
+            elapsed += time.perf_counter() - start
+        with prof.stage("histogram"):
+            hist.update(chunk / (m + 1))  # Normalize and count
+
+    with prof.stage("ks"):
+        D, ks_p_value, _ = hist.ks()
+    with prof.stage("chi"):
+        chi2_stat, chi_p_value = hist.chi(CHI_BINS)
+    return {
+        "ks": (D, ks_p_value, int(ks_p_value < ALPHA)),
+        "chi": (chi2_stat, chi_p_value, int(chi_p_value < ALPHA)),
+        "numbers": np.empty(0),  # Too many to store
+        "time": elapsed,
+    }
+
+
+# Conduct tests for external libraries, sampled concurrently from persistent
+# workers that are built once and stay alive in this process between calls
+def conduct_external_test(n: int) -> dict[str, dict]:
+    data = clct.main(n, timeouts=EXTERN_TIMEOUTS)
+    for failure in data.failures.values():
+        print(f"Skipping {failure}")
 
     results = {}
 
-    for key, value in data.items():
+    for key, value in data.samples.items():
+        with prof.tags(algo=key):
+            with prof.stage("ks"):
+                ks_result = ks(value)
+            with prof.stage("chi"):
+                chi_result = chi(value)
         results[key] = {
-            "ks": ks(value),
-            "chi": chi(value),
+            "ks": ks_result,
+            "chi": chi_result,
             "numbers": value,
             "time": 0,
         }
@@ -120,102 +200,353 @@ def conduct_external_test() -> dict[str, dict]:
     return results
 
 
-# Run tests for all algorithms and store results in the database
-def start_tests(
-    algo_list: dict, index: int, conn: sq.Connection, generate_binary: bool
-) -> None:
-    th = f"[THREAD {index:03}]\t"
-    for key, value in algo_list.items():
-        m = M_INITIAL  # Start with the initial value of 'm'
-        while m <= M_LIMIT:
-            print(th + "=" * 50)
-            print(f"{th}Testing {key} with m = {m}")
-
-            # Conduct tests and generate database entry
-            stats = conduct_test(m, index, value)
-
-            # Generate binary file
-            if generate_binary:
-                print(f"{th}Generating Binary Files")
-                gen.generate_binary_file(
-                    f"{RESULTS_DIR + BIN_DIR}/test_{index}_{key}_{m}.bin",
-                    stats["numbers"],
-                )
-                print(f"{th}Generated Binary Files for {key} with m = {m}")
-
-            # Generate database entry
-            stats = db.generate_entry(stats, key, m, N, ALPHA)
-
-            # Insert test results into the database
-            print(f"{th}Entering values into database for {key} with m = {m}")
-            db.enter_values(stats, conn)
-            print(f"{th}Values entered successfully")
-
-            m *= M_MULTIPLIER  # Increment 'm' by the multiplier
-            print(f"[THREAD {index:03}]\t" + "=" * 50)
-
+# Values of m covered by the sweep
+def m_values() -> list[int]:
+    values = []
     m = M_INITIAL  # Start with the initial value of 'm'
     while m <= M_LIMIT:
-        # Conduct tests for external libraries
-        print(f"{th}Conducting Tests for External Libraries")
-        result = conduct_external_test()
-        for key, stats in result.items():
-            # Generate database entry
-            stats = db.generate_entry(stats, key, m, N, ALPHA)
-            print(f"{th}Entering values into database for {key}")
-            db.enter_values(stats, conn)
-            print(f"{th}Values entered successfully")
+        values.append(m)
         m *= M_MULTIPLIER  # Increment 'm' by the multiplier
+    return values
+
+
+# Seed of the hybrids of thread index, mixed from HYBRID_SEED so that no two
+# threads share lanes or reseeds
+def thread_seed(index: int) -> int:
+    return ent.derive(HYBRID_SEED, index)
+
+
+class Cell(NamedTuple):
+    # One point of the sweep grid. a and w are None for the algorithms that
+    # do not take them (the reference generators ignore a, only the
+    # reseeding hybrids take w).
+    thread: int
+    algo: str
+    m: int
+    n: int
+    a: int
+    w: float
+    binary: bool
+
+
+# Reseed period w an algorithm takes by default, or None if it takes none
+def default_w(key: str) -> float:
+    parameter = inspect.signature(algorithm(key)).parameters.get("w")
+    return None if parameter is None else parameter.default
+
+
+# Grids of the sweep, falling back to env.config: m from M_INITIAL to
+# M_LIMIT, N, a = 5 * 10^thread and each algorithm's own w
+def sweep_grid(algos: list[str] = None, m=None, n=None, a=None, w=None) -> dict:
+    algos = algos or list(algo_list) + [EXTERNAL]
+    known = registry.names("algorithm")
+    unknown = [key for key in algos if key != EXTERNAL and key not in known]
+    if unknown:
+        sys.exit(f"Unknown algorithms: {', '.join(unknown)} (choose from {', '.join(known)}, {EXTERNAL})")
+    return {"algos": algos, "m": m or m_values(), "n": n or [N], "a": a, "w": w}
+
+
+# Expand the grids into the cells of every thread (data set)
+def build_tasks(threads: int, generate_binary: bool, grid: dict = None) -> list[Cell]:
+    grid = grid or sweep_grid()
+    tasks = []
+    for index in range(threads):
+        for key in grid["algos"]:
+            if key == EXTERNAL:
+                # External libraries are collected once per (m, n)
+                for m, n in itertools.product(grid["m"], grid["n"]):
+                    tasks.append(Cell(index, EXTERNAL, m, n, None, None, False))
+                continue
+            if key in gens.REFERENCE:
+                a_values = [None]
+            elif registry.get("algorithm", key).exponent:
+                a_values = grid["a"] or [index]  # The function scales 'a' itself
+            else:
+                a_values = grid["a"] or [5 * (10**index)]  # Scale 'a' by a factor
+            w_values = [None] if default_w(key) is None else grid["w"] or [default_w(key)]
+            for m, n, a, w in itertools.product(grid["m"], grid["n"], a_values, w_values):
+                tasks.append(Cell(index, key, m, n, a, w, generate_binary))
+    return tasks
+
+
+# Relative cost of each algorithm per number, measured on a short run
+def calibrate(keys, sample: int = 1000) -> dict[str, float]:
+    costs = {}
+    for key in set(keys) - {EXTERNAL}:
+        func = algorithm(key)
+        costs[key] = timeit.timeit(lambda: func(M_INITIAL, sample, 5), number=1)
+    # Compiling and running the external programs outweighs any generator
+    costs[EXTERNAL] = float("inf")
+    return costs
+
+
+# Short description of a cell for log lines and file names
+def describe(cell: Cell, sep: str = ", ") -> str:
+    parts = [f"m = {cell.m}", f"n = {cell.n}"]
+    if cell.a is not None:
+        parts.append(f"a = {cell.a}")
+    if cell.w is not None:
+        parts.append(f"w = {cell.w}")
+    if sep != ", ":
+        parts = [part.replace(" = ", "") for part in parts]
+    return sep.join(parts)
+
+
+# Run one cell in a worker process; returns (algorithm, stats) pairs
+def run_cell(cell: Cell) -> list[tuple[str, dict]]:
+    with prof.tags(algo=cell.algo, m=cell.m, n=cell.n, thread=cell.thread):
+        try:
+            return measure_cell(cell)
+        finally:
+            prof.flush(PROFILE_SPOOL)
+
+
+# Test the algorithm of one cell and write its binary file
+def measure_cell(cell: Cell) -> list[tuple[str, dict]]:
+    index, key, m, n, a, w, generate_binary = cell
+    th = f"[THREAD {index:03}]\t"
 
+    if key == EXTERNAL:
+        # Conduct tests for external libraries
+        print(f"{th}Conducting Tests for External Libraries with {describe(cell)}")
+        return list(conduct_external_test(n).items())
+
+    print(f"{th}Testing {key} with {describe(cell)}")
+    func = generator = algorithm(key)
+    entry = registry.get("algorithm", key)
+    # Seeded reference generators draw from a per-thread substream
+    if entry.streams:
+        func = partial(func, stream=index)
+    # Hybrid generators draw from a per-thread seed, unless clock-seeded
+    seed = None
+    if HYBRID_SEED is not None and entry.seedable and not entry.streams:
+        seed = thread_seed(index)
+        func = partial(func, seed=seed)
+    kwargs = {} if w is None else {"w": w}
+
+    # Conduct tests and generate database entry; only the generators
+    # with a chunked stream can be tested without holding all n numbers
+    if n > STREAM_THRESHOLD and gens.has_stream(generator):
+        stream = index if entry.streams else 0
+        stats = conduct_stream_test(m, n, a, generator, stream, seed, **kwargs)
+    else:
+        stats = conduct_test(m, n, a, partial(func, **kwargs))
+
+    # Generate binary file
+    if generate_binary:
+        print(f"{th}Generating Binary Files")
+        path = f"{RESULTS_DIR + BIN_DIR}/test_{index}_{key}_{describe(cell, '_')}.bin"
+        with prof.stage("binary"):
+            if BIN_MODE == "words" and key in gens.REFERENCE:
+                # Full output words of the same substream, written in chunks
+                source = gens.seeded(gens.REFERENCE[key], stream=index)
+                gen.generate_word_file(path, source, n, STREAM_CHUNK)
+            elif len(stats["numbers"]):
+                gen.generate_binary_file(path, stats["numbers"])
+        print(f"{th}Generated Binary Files for {key} with {describe(cell)}")
+
+    return [(key, stats)]
+
+
+# Hash of the code behind an algorithm's cells: the generator and the tests
+@lru_cache(maxsize=None)
+def code_hash(key: str) -> str:
+    return cache.code_hash(algorithm(key), st, battery, streaming)
+
+
+# Cache key of a cell, or None when its results are not reproducible
+def cell_key(cell: Cell) -> str:
+    index, key, m, n, a, w, generate_binary = cell
+    # External programs and clock-seeded hybrids differ on every run, and
+    # cells writing binary files have to run to write them
+    if key == EXTERNAL or generate_binary:
+        return None
+    entry = registry.get("algorithm", key)
+    if not entry.streams and (HYBRID_SEED is None or not entry.seedable):
+        return None
+    params = {
+        "algo": key,
+        "m": m,
+        "n": n,
+        "a": a,
+        "w": w,
+        "alpha": ALPHA,
+        "chi_bins": CHI_BINS,
+        "battery": BATTERY,
+        "stream": index if entry.streams else 0,
+        "seed": None if entry.streams else thread_seed(index),
+        "stream_bins": STREAM_BINS if n > STREAM_THRESHOLD else None,
+    }
+    return cache.cell_key(code_hash(key), params)
 
-# Main function to initialize the database and run tests
-def tester(index: int = 0, generate_binary: bool = False) -> None:
-    # Remove existing database if it exists
-    if os.path.exists(f"{RESULTS_DIR + DB_DIR}/test_{index}.db"):
-        os.remove(f"{RESULTS_DIR + DB_DIR}/test_{index}.db")
-
-    # Connect to a new SQLite database
-    conn = sq.connect(f"{RESULTS_DIR + DB_DIR}/test_{index}.db")
-    print(f"[THREAD {index:03}]\tOpened database successfully")
-
-    # Setup database tables and start tests
-    db.setup_table(conn)
-    start_tests(algo_list, index, conn, generate_binary)
 
-    conn.close()
+# Open the result cache, or None when CACHE_MAX_MB is 0
+def open_cache() -> cache.ResultCache:
+    if CACHE_MAX_MB <= 0:
+        return None
+    return cache.ResultCache(RESULTS_CACHE, int(CACHE_MAX_MB * 2**20), RAND_COMPRESS)
 
 
-def main() -> None:
-    # Get the number of threads from the user
-    threads = int(input("Number of Threads: "))
-    generate_binary = input("Generate Binary Files? (y/n): ").lower() == "y"
-    t = []
+# Settings a resumed sweep must share with the one it continues
+def sweep_params(generate_binary: bool) -> dict:
+    return {
+        "generate_binary": generate_binary,
+        "alpha": ALPHA,
+        "chi_bins": CHI_BINS,
+        "battery": BATTERY,
+        "hybrid_seed": HYBRID_SEED,
+        "bin_mode": BIN_MODE,
+    }
 
-    # Create and start threads for parallel testing
-    for i in range(threads):
-        thread = threading.Thread(
-            target=tester,
-            args=(
-                i,
-                generate_binary,
-            ),
-        )
-        thread.start()
-        t.append(thread)
 
-    # Wait for all threads to complete
-    for thread in t:
-        thread.join()
+# Open the database for the sweep: the existing one when resuming a sweep
+# with the same settings, else a fresh one
+def open_database(params: dict, resume: bool = False) -> sq.Connection:
+    if resume and os.path.exists(RESULTS_DB):
+        conn = db.connect(RESULTS_DB)
+        saved = db.load_sweep(conn)
+        if saved == params:
+            print("Resuming the sweep in the existing database")
+            return conn
+        conn.close()
+        if saved is not None:
+            changed = sorted(k for k in params if saved.get(k) != params[k])
+            sys.exit(f"Cannot resume: {', '.join(changed)} changed since the sweep started")
+        print("No sweep to resume, starting afresh")
 
-    algs = list(algo_list.keys()) + ["C", "C++", "Rust", "JS", "Java", "PHP"]
+    # Remove existing database if it exists
+    for suffix in ("", "-wal", "-shm"):
+        if os.path.exists(RESULTS_DB + suffix):
+            os.remove(RESULTS_DB + suffix)
 
-    cmp.main(threads, algs, RESULTS_DIR + DB_DIR)
+    # Connect to a new SQLite database
+    conn = db.connect(RESULTS_DB)
+    print("Opened database successfully")
 
-    selected = vis.get_selection()
+    db.setup_table(conn)
+    db.save_sweep(conn, params)
+    return conn
+
+
+# Run the sweep in a process pool and store results from a single writer.
+# Cells found in the result cache are not run again, and with resume, nor
+# are the cells the Journal of an interrupted sweep lists as done.
+def tester(
+    threads: int,
+    generate_binary: bool = False,
+    workers: int = None,
+    resume: bool = False,
+    grid: dict = None,
+) -> None:
+    conn = open_database(sweep_params(generate_binary), resume)
+    store = open_cache()
+    tasks = build_tasks(threads, generate_binary, grid)
+    if prof.ENABLED:
+        prof.clear(PROFILE_SPOOL)
+
+    done = db.completed_cells(conn)
+    if done:
+        tasks = [task for task in tasks if task[:6] not in done]
+        print(f"Skipping {len(done)} cells completed before")
+
+    keys, hits = {}, []
+    if store is not None:
+        for task in tasks:
+            key = cell_key(task)
+            with prof.stage("cache.get"):
+                stats = store.get(key) if key else None
+            if stats is not None:
+                hits.append((task, [(task[1], stats)]))
+            elif key:
+                keys[task] = key
+        print(f"Reusing {len(hits)} of {len(tasks)} cells from the cache")
+    cached = {task for task, _ in hits}
+    pending = [task for task in tasks if task not in cached]
+
+    with prof.stage("calibrate"):
+        costs = calibrate(task.algo for task in pending)
+    results = sched.run(
+        run_cell, pending, workers=workers, cost=lambda task: costs[task.algo] * task.n
+    )
+    try:
+        with db.ResultWriter(conn, DB_COMMIT_EVERY) as writer:
+            for task, entries in itertools.chain(hits, results):
+                index, m, n = task.thread, task.m, task.n
+                if task in keys:
+                    with prof.stage("cache.put"):
+                        store.put(keys[task], entries[0][1], CACHE_SAMPLES)
+                th = f"[THREAD {index:03}]\t"
+                rows = []
+                for key, stats in entries:
+                    # Generate database entry
+                    stats = db.generate_entry(
+                        stats,
+                        key,
+                        m,
+                        n,
+                        ALPHA,
+                        compress=RAND_COMPRESS,
+                        sidecar_dir=RESULTS_DIR + NPY_DIR
+                        if RAND_STORAGE == "npy"
+                        else None,
+                        thread=index,
+                        a=task.a,
+                        w=task.w,
+                    )
+
+                    # Queue test results for the next batched insert
+                    print(f"{th}Entering values into database for {key} with m = {m}")
+                    rows.append(stats)
+                writer.add_cell(rows, task[:6])
+                print(f"{th}Values entered successfully")
+    finally:
+        conn.close()
+        if store is not None:
+            store.close()
+        if prof.ENABLED:
+            prof.flush(PROFILE_SPOOL)
+            prof.report(PROFILE_SPOOL, RESULTS_DIR + PROFILE_DIR)
+
+
+def main(argv: list[str] = None) -> None:
+    # Settings from the command line and --config; anything not given there
+    # is prompted for, or defaulted when headless
+    args = cli.load(argv)
+    if args.profile:
+        prof.enable(alloc=args.profile == "alloc")
+    # Stop like Ctrl+C when the machine is preempted, so the finished
+    # cells are committed before exiting
+    signal.signal(signal.SIGTERM, signal.default_int_handler)
+
+    # Get the number of threads (independent data sets) and worker processes
+    threads, workers, generate_binary = args.threads, args.workers, args.binary
+    if args.headless:
+        vis.headless(RESULTS_DIR + PLOT_DIR)
+        threads = threads or 1
+        generate_binary = bool(generate_binary)
+    if threads is None:
+        threads = int(input("Number of Threads: "))
+    if workers is None and not args.headless:
+        workers = int(input("Number of Workers (blank for all cores): ") or 0)
+    if generate_binary is None:
+        generate_binary = input("Generate Binary Files? (y/n): ").lower() == "y"
+
+    grid = sweep_grid(args.algos, args.m, args.n, args.a, args.w)
+    tester(threads, generate_binary, workers or os.cpu_count(), bool(args.resume), grid)
+
+    algs = [key for key in grid["algos"] if key != EXTERNAL]
+    if EXTERNAL in grid["algos"]:
+        algs += registry.names("extern")
+
+    cmp.main(algs, RESULTS_DB)
+
+    if args.plots is None and args.headless:
+        args.plots = [0]
+    selected = vis.get_selection(args.plots)
 
     # Visualize results for each thread's data
     for i in range(threads):
-        vis.main(algs, f"{RESULTS_DIR + DB_DIR}/test_{i}.db", selected)
+        vis.main(algs, RESULTS_DB, selected, thread=i)
 
 
 # Entry point for the program
@@ -223,4 +554,4 @@ if __name__ == "__main__":
     try:
         main()
     except KeyboardInterrupt:
-        print("\n\nExiting tests...")
+        print("\n\nExiting tests... (run with --resume to continue)")
@@ -1,59 +1,62 @@
-import json
+from pathlib import Path
+
 import pandas as pd
 import seaborn as sns
+import matplotlib
 import matplotlib.pyplot as plt
 import numpy as np
-import sqlite3 as sq
 
-# Define m values and their logarithmic equivalents for plotting
-m_values = np.array([10**i for i in range(2, 12)])
-log_m_values = np.log10(m_values)
+import query as qry
 
+# Directory the plots are saved to instead of shown (see headless)
+SAVE_DIR = None
 
-# Set SQLite database row factory to return rows as dictionaries
-def dict_factory(cursor: sq.Cursor, row: tuple) -> dict:
-    d = {}
-    for idx, col in enumerate(cursor.description):
-        d[col[0]] = row[idx]
-    return d
 
+# Draw without a display: every plot is saved as a PNG file in directory
+def headless(directory: str) -> None:
+    global SAVE_DIR
+    matplotlib.use("Agg")
+    Path(directory).mkdir(parents=True, exist_ok=True)
+    SAVE_DIR = directory
 
-# Fetch test data for a given algorithm and database index
-def fetch_data(alg: str, path: str, select: list[str] = ["*"]) -> list:
-    conn = sq.connect(path)
-    conn.row_factory = dict_factory
-    cursor = conn.cursor()
-    cursor.execute(
-        f"SELECT {", ".join(select)} FROM RandomnessTests WHERE ALGO = ? ORDER BY M ASC",
-        (alg,),
-    )
-    rows = cursor.fetchall()
-    conn.close()
-    return rows
+
+# Show the current figure, or save it as `name` when headless
+def show(name: str, thread: int = None) -> None:
+    if SAVE_DIR is None:
+        plt.show()
+        return
+    suffix = "" if thread is None else f"_{thread}"
+    plt.savefig(f"{SAVE_DIR}/{name}{suffix}.png", bbox_inches="tight")
+    plt.close("all")
+
+
+# m values of an algorithm and the mean of a column at each, averaging over
+# the other grid axes (N, a, w) of the sweep
+def per_m(path: str, algo: str, column: str, thread: int = None) -> tuple:
+    cols = qry.columns(path, algo, ["M", column], thread)
+    ms, inverse = np.unique(cols["M"], return_inverse=True)
+    values = cols[column].astype(float)
+    return ms, np.bincount(inverse, weights=values) / np.bincount(inverse)
 
 
 # Plot statistical test results (K-S and Chi-Square) for algorithms
-def stat_plot(algo_list: list[str], path: str) -> None:
+def stat_plot(algo_list: list[str], path: str, thread: int = None) -> None:
     ks_stats = {}
     chi_stats = {}
 
     # Collect test statistics for each algorithm
     for key in algo_list:
-        ks_stats[key] = []
-        chi_stats[key] = []
-        rows = fetch_data(key, path)
-        for row in rows:
-            ks_stats[key].append(row["D_STAT"])
-            chi_stats[key].append(row["CHI_2_STAT"])
-        ks_stats[key] = np.array(ks_stats[key])
-        chi_stats[key] = np.array(chi_stats[key])
+        ks_stats[key] = per_m(path, key, "D_STAT", thread)
+        chi_stats[key] = per_m(path, key, "CHI_2_STAT", thread)
 
     # Create subplots for the two test statistics
     _, (ax1, ax2) = plt.subplots(1, 2, figsize=(12, 6))
 
     for algo in algo_list:
-        ax1.plot(log_m_values, ks_stats[algo], label=f"{algo}")
-        ax2.plot(log_m_values, chi_stats[algo], label=f"{algo}")
+        ms, values = ks_stats[algo]
+        ax1.plot(np.log10(ms), values, label=f"{algo}")
+        ms, values = chi_stats[algo]
+        ax2.plot(np.log10(ms), values, label=f"{algo}")
 
     # Set titles, labels, and legends
     ax1.set_title("Kolmogorov-Smirnov Test Statistics")
@@ -67,47 +70,30 @@ def stat_plot(algo_list: list[str], path: str) -> None:
     ax2.legend()
 
     plt.tight_layout()
-    plt.show()
+    show("statistics", thread)
 
 
 # Plot p-values for the statistical tests
-def p_plot(algo_list: list[str], path: str) -> None:
+def p_plot(algo_list: list[str], path: str, thread: int = None) -> None:
     ks_p_value = {}
     chi_p_value = {}
 
     # Collect p-values for each algorithm
     for key in algo_list:
-        ks_p_value[key] = []
-        chi_p_value[key] = []
-        rows = fetch_data(key, path)
-        for row in rows:
-            ks_p_value[key].append(row["KS_P_VALUE"])
-            chi_p_value[key].append(row["CHI_P_VALUE"])
-        ks_p_value[key] = np.array(ks_p_value[key])
-        chi_p_value[key] = np.array(chi_p_value[key])
+        cols = qry.columns(path, key, ["M", "KS_P_VALUE", "CHI_P_VALUE"], thread)
+        ks_p_value[key] = np.log10(cols["M"]), cols["KS_P_VALUE"]
+        chi_p_value[key] = np.log10(cols["M"]), cols["CHI_P_VALUE"]
 
     # Create subplots for p-values
     _, (ax1, ax2) = plt.subplots(1, 2, figsize=(12, 6))
 
     for algo in algo_list:
-        ax1.scatter(log_m_values, ks_p_value[algo], label=f"{algo} - K-S")
-        ax2.scatter(log_m_values, chi_p_value[algo], label=f"{algo} - Chi^2")
+        ax1.scatter(*ks_p_value[algo], label=f"{algo} - K-S")
+        ax2.scatter(*chi_p_value[algo], label=f"{algo} - Chi^2")
 
     ##Plot a line through threshhold of 0.05
-    ax1.plot(
-        log_m_values,
-        np.array([0.05] * 10),
-        label="Alpha (0.05)",
-        linestyle="dashed",
-        color="red",
-    )
-    ax2.plot(
-        log_m_values,
-        np.array([0.05] * 10),
-        label="Alpha (0.05)",
-        linestyle="dashed",
-        color="red",
-    )
+    ax1.axhline(0.05, label="Alpha (0.05)", linestyle="dashed", color="red")
+    ax2.axhline(0.05, label="Alpha (0.05)", linestyle="dashed", color="red")
 
     # Set titles, labels, and legends
     ax1.set_title("Kolmogorov-Smirnov Test Statistics")
@@ -121,39 +107,34 @@ def p_plot(algo_list: list[str], path: str) -> None:
     ax2.legend()
 
     plt.tight_layout()
-    plt.show()
+    show("p_values", thread)
 
 
-def ex_time_plot(algo_list: list[str], path: str) -> None:
+def ex_time_plot(algo_list: list[str], path: str, thread: int = None) -> None:
     for key in algo_list:
-        rows = fetch_data(key, path)
-        data = []
-        for row in rows:
-            data.append(row["TIME"])
-        data = np.array(data)
-        plt.plot(log_m_values, data, label=f"{key}")
+        ms, data = per_m(path, key, "TIME", thread)
+        plt.plot(np.log10(ms), data, label=f"{key}")
     plt.xlabel("Value of m")
     plt.ylabel("Time (s)")
     plt.title("Execution Time for Different Algorithms and m Values")
     plt.legend()
-    plt.show()
+    show("execution_time", thread)
 
 
 # Visualize test rejection data using a heatmap
-def rejection_heatmap(algo_list: list[str], path: str) -> None:
+def rejection_heatmap(algo_list: list[str], path: str, thread: int = None) -> None:
     data = {}
 
-    # Collect rejection results for each algorithm
+    # Collect rejection results (rates, when a grid has several cells per m)
+    # for each algorithm
     for key in algo_list:
-        data[f"{key}_ks"] = []
-        data[f"{key}_chi"] = []
-        rows = fetch_data(key, path)
-        for row in rows:
-            data[f"{key}_ks"].append(row["KS_REJECTED"])
-            data[f"{key}_chi"].append(row["CHI_REJECTED"])
+        for test, column in (("ks", "KS_REJECTED"), ("chi", "CHI_REJECTED")):
+            ms, rates = per_m(path, key, column, thread)
+            data[f"{key}_{test}"] = pd.Series(rates, index=ms)
 
     # Create a DataFrame for heatmap
-    df = pd.DataFrame(data, index=[f"M={i}" for i in m_values])
+    df = pd.DataFrame(data)
+    df.index = [f"M={int(i)}" for i in df.index]
 
     # Plot the heatmap
     plt.figure(figsize=(10, 8))
@@ -161,26 +142,23 @@ def rejection_heatmap(algo_list: list[str], path: str) -> None:
         df,
         annot=True,
         cmap="coolwarm",
-        cbar_kws={"label": "Rejection (1 = Rejected, 0 = Not Rejected)"},
+        cbar_kws={"label": "Rejection rate (1 = Rejected, 0 = Not Rejected)"},
     )
     plt.title("Test Rejections for Different Algorithms and m Values")
     plt.ylabel("Test m values")
     plt.xticks(rotation=45)
-    plt.show()
+    show("rejections", thread)
 
 
 # Visualize random number distributions using boxplots
-def random_numbers(algo_list: list[str], path: str) -> None:
-    _, ax = plt.subplots(1, len(algo_list), figsize=(12, 6))
+def random_numbers(algo_list: list[str], path: str, thread: int = None) -> None:
+    _, ax = plt.subplots(1, len(algo_list), figsize=(12, 6), squeeze=False)
+    ax = ax[0]
 
     for i, key in enumerate(algo_list):
-        rows = fetch_data(key, path)
-        data = []  # Collect random numbers for boxplot
-        labels = []  # Labels for the boxplot
-        for row in rows:
-            row["RAND_NUMS"] = np.array(json.loads(row["RAND_NUMS"]))
-            data.append(row["RAND_NUMS"])
-            labels.append(f"m = {row['M']}")
+        # Collect random numbers for boxplot, with labels for each m
+        ms, data = qry.numbers(path, key, thread)
+        labels = [f"m = {m}" for m in ms]
 
         # Plot a boxplot
         sns.boxplot(data=data, ax=ax[i])
@@ -194,21 +172,23 @@ def random_numbers(algo_list: list[str], path: str) -> None:
         ax[i].set_xticklabels(labels, rotation=45, ha="right", fontsize=10)
 
     plt.tight_layout()
-    plt.show()
-
+    show("distribution", thread)
 
-def get_selection() -> set:
-    # Prompt user for visualization options
-    print("Select to Visualize Data: ")
-    print("\t[0] All")
-    print("\t[1] Statistics")
-    print("\t[2] P Values")
-    print("\t[3] Rejections Heatmap")
-    print("\t[4] Random Numbers Distribution")
-    print("\t[5] Execution Time")
 
+def get_selection(choices: list[int] = None) -> set:
+    # Prompt user for visualization options, unless given the choices
     allowed = {0, 1, 2, 3, 4, 5}
-    selected = set(map(int, input(">> ").split())).intersection(allowed)
+    if choices is None:
+        print("Select to Visualize Data: ")
+        print("\t[0] All")
+        print("\t[1] Statistics")
+        print("\t[2] P Values")
+        print("\t[3] Rejections Heatmap")
+        print("\t[4] Random Numbers Distribution")
+        print("\t[5] Execution Time")
+        choices = map(int, input(">> ").split())
+
+    selected = set(choices).intersection(allowed)
 
     if 0 in selected:
         selected = allowed - {0}
@@ -217,37 +197,46 @@ def get_selection() -> set:
 
 
 # Main function to invoke specific visualizations
-def main(algo_list: list[str], path: str, selected: set[int] = {1, 2, 3, 4, 5}) -> None:
+def main(
+    algo_list: list[str],
+    path: str,
+    selected: set[int] = {1, 2, 3, 4, 5},
+    thread: int = None,
+) -> None:
     if 1 in selected:
-        stat_plot(algo_list, path)
+        stat_plot(algo_list, path, thread)
     if 2 in selected:
-        p_plot(algo_list, path)
+        p_plot(algo_list, path, thread)
     if 3 in selected:
-        rejection_heatmap(algo_list, path)
+        rejection_heatmap(algo_list, path, thread)
     if 4 in selected:
-        random_numbers(algo_list, path)
+        random_numbers(algo_list, path, thread)
     if 5 in selected:
-        ex_time_plot(algo_list, path)
+        ex_time_plot(algo_list, path, thread)
 
 
 # Entry point for the program
 if __name__ == "__main__":
-    from test import algo_list, RESULTS_DIR, DB_DIR
-
-    algs = list(algo_list.keys()) + [
-        "C",
-        "C++",
-        "Rust",
-        "JS",
-        "Java",
-        "PHP",
-    ]
-
-    threads = int(input("Thread: "))
+    import argparse
+
+    import registry
+    from settings import RESULTS_DB, RESULTS_DIR, PLOT_DIR
+
+    parser = argparse.ArgumentParser(description="Plot the results of the last sweep.")
+    parser.add_argument("--threads", type=int, help="number of data sets to plot")
+    parser.add_argument("--plots", nargs="+", type=int, help="plots to draw (as in the menu)")
+    parser.add_argument("--headless", action="store_true", help="save the plots to PLOT_DIR")
+    args = parser.parse_args()
+
+    algs = registry.names("algorithm", "sweep") + registry.names("extern")
+
+    if args.headless:
+        headless(RESULTS_DIR + PLOT_DIR)
     try:
-        selected = get_selection()
+        threads = args.threads or int(input("Thread: "))
+        selected = get_selection(args.plots)
         for i in range(threads):
-            main(algs, f"{RESULTS_DIR + DB_DIR}/test_{i}.db", selected)
+            main(algs, RESULTS_DB, selected, thread=i)
     except KeyboardInterrupt:
         print("\n\nExiting tests...")
 